@@ -0,0 +1,134 @@
+import random
+from benchmarks.harness import benchmark
+from game.combat import CombatEngine
+from game.events import EventCatalog, EventDirector
+from game.game_board import GameBoard, Location
+from game.items import ITEMS
+from game.quests import ReachPosition, StatThreshold
+from models.character import Character, Warrior
+from models.inventory import Inventory
+from models.quest import Quest, QuestLog
+
+BOARD_SIZES = (10, 100, 1000)
+QUEST_COUNTS = (10, 1000)
+
+
+def board_generation(size, sparse=False):
+    def factory():
+        board = GameBoard(size, sparse=sparse, rng=random.Random(0))
+        return board.generate_board
+    return factory
+
+
+def boss_placement(size):
+    def factory():
+        return GameBoard(size, rng=random.Random(0)).place_bosses
+    return factory
+
+
+for size in BOARD_SIZES:
+    benchmark(f"board.generate[{size}]", 'board')(board_generation(size))
+    benchmark(f"board.place_bosses[{size}]", 'board')(boss_placement(size))
+benchmark("board.generate[sparse-100000]", 'board')(board_generation(100_000, sparse=True))
+
+
+@benchmark("combat.turn", 'combat')
+def combat_turn():
+    player = Warrior("Bench", None)
+    enemy = Character("Dummy", None, 10, 5, 5, 5)
+    # Both sides can take hits for far longer than the benchmark runs
+    player.health = enemy.health = 1 << 30
+    engine = CombatEngine(player, enemy, rng=random.Random(0), record=False)
+    return lambda: engine.step('attack')
+
+
+@benchmark("combat.turn[recorded]", 'combat')
+def recorded_combat_turn():
+    player = Warrior("Bench", None)
+    enemy = Character("Dummy", None, 10, 5, 5, 5)
+    player.health = enemy.health = 1 << 30
+    engine = CombatEngine(player, enemy, rng=random.Random(0))
+
+    def turn():
+        engine.step('attack')
+        engine.records.clear()
+    return turn
+
+
+def quest_tick(count):
+    # One move of the player with `count` quests watching the tiles it walks
+    # between; none can complete, so every tick does the same work
+    def factory():
+        player = Warrior("Bench", None)
+        quests = QuestLog([Quest(f"Quest {i}", "", [], [ReachPosition((i % 2, 0)),
+                                                        StatThreshold('strength', 1000)])
+                           for i in range(count)])
+        quests.watch(player)
+        tiles = [(1, 0), (0, 0)]
+
+        def tick():
+            player.position = tiles[player.position[0]]
+        return tick
+    return factory
+
+
+def quest_check(count):
+    def factory():
+        player = Warrior("Bench", None)
+        quests = QuestLog([Quest(f"Quest {i}", "", [], [StatThreshold('strength', 1000)])
+                           for i in range(count)])
+        quests.watch(player)
+        return lambda: quests.check(player)
+    return factory
+
+
+for count in QUEST_COUNTS:
+    benchmark(f"quests.tick[{count}]", 'quests')(quest_tick(count))
+    benchmark(f"quests.check[{count}]", 'quests')(quest_check(count))
+
+
+@benchmark("inventory.add_remove", 'inventory')
+def inventory_add_remove():
+    inventory = Inventory()
+    item = ITEMS['Health Potion']
+
+    def cycle():
+        inventory.add_item(item)
+        inventory.remove_item(item)
+    return cycle
+
+
+@benchmark("inventory.contains", 'inventory')
+def inventory_contains():
+    inventory = Inventory()
+    for item in list(ITEMS.values())[:5]:
+        inventory.add_item(item, 3)
+    return lambda: 'Dragon Egg' in inventory
+
+
+@benchmark("inventory.total_value", 'inventory')
+def inventory_total_value():
+    inventory = Inventory()
+    for item in ITEMS.values():
+        inventory.add_item(item, 3)
+    return inventory.get_total_value
+
+
+def event_draw(count):
+    # A step's event roll against a table of `count` weighted events
+    def factory():
+        catalog = EventCatalog([{'name': f"Event {i}", 'message': "", 'effects': [('gold', 1)]}
+                                for i in range(count)],
+                               {'all': {'chance': 1.0, 'events': {f"Event {i}": i % 7 + 1 for i in range(count)}}},
+                               default_table='all')
+        director = EventDirector(catalog)
+        location = Location("Wilderness", "#4a6741")
+        player = Warrior("Bench", None)
+        rng = random.Random(0)
+        director.draw(location, player, rng)  # Compile the table outside the timing
+        return lambda: director.draw(location, player, rng)
+    return factory
+
+
+for count in (10, 100_000):
+    benchmark(f"events.draw[{count}]", 'events')(event_draw(count))
@@ -0,0 +1,63 @@
+from PyQt5.QtWidgets import QApplication
+from benchmarks.harness import benchmark
+from game.session import GameSession
+from gui.main_window import GameGUI
+from gui.theme import apply_theme
+from gui.widgets import CharacterInfoWidget
+from models.character import Warrior
+
+# The application and widgets are kept alive for the whole run
+windows = []
+app = None
+
+
+def application():
+    global app
+    if app is None:
+        app = QApplication.instance() or QApplication(['benchmarks'])
+        apply_theme(app)
+    return app
+
+
+def game_window(board_size):
+    application()
+    window = GameGUI(GameSession(Warrior("Bench", None), seed=0, board_size=board_size))
+    window.resize(1100, 900)
+    window.show()
+    QApplication.processEvents()
+    windows.append(window)
+    return window
+
+
+def map_update(board_size):
+    # Move one tile inside the viewport and paint the result, as a step does;
+    # the position change reaches update_game_map through the window's handler
+    def factory():
+        window = game_window(board_size)
+        player = window.player
+        tiles = [(1, 0), (0, 0)]
+
+        def update():
+            player.position = tiles[player.position[0]]
+            window.game_map.repaint()
+            window.minimap.repaint()
+        return update
+    return factory
+
+
+for size in (10, 1000):
+    benchmark(f"gui.update_game_map[{size}]", 'gui')(map_update(size))
+
+
+@benchmark("gui.character_info.update_info", 'gui')
+def character_info_update():
+    application()
+    widget = CharacterInfoWidget(Warrior("Bench", None))
+    widget.show()
+    QApplication.processEvents()
+    windows.append(widget)
+
+    def update():
+        widget.update_info()
+        widget.repaint()
+    return update
@@ -0,0 +1,81 @@
+import gc
+import statistics
+import time
+
+# name -> (group, factory); a factory does its setup and returns the callable to time
+BENCHMARKS = {}
+
+
+def benchmark(name, group):
+    def register(factory):
+        BENCHMARKS[name] = (group, factory)
+        return factory
+    return register
+
+
+def calibrate(func, min_time):
+    # Grow the loop count until one repeat is long enough to time reliably
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time or number >= 1 << 20:
+            return number
+        number *= 10 if elapsed < min_time / 10 else 2
+
+
+def measure(func, repeat=5, min_time=0.05):
+    number = calibrate(func, min_time)
+    times = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()  # A collection landing in one repeat would swamp small timings
+    try:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            for _ in range(number):
+                func()
+            times.append((time.perf_counter() - started) / number)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return {
+        'number': number,
+        'repeat': repeat,
+        'min': min(times),
+        'median': statistics.median(times),
+        'max': max(times),
+    }
+
+
+def run(names, repeat=5, min_time=0.05, report=None):
+    results = {}
+    for name in names:
+        group, factory = BENCHMARKS[name]
+        result = measure(factory(), repeat, min_time)
+        result['group'] = group
+        results[name] = result
+        if report is not None:
+            report(name, result)
+    return results
+
+
+def compare(results, baseline, threshold=0.2):
+    # Per benchmark (name, baseline, current, ratio, status); fastest repeats
+    # are compared because they are the least disturbed by the rest of the machine
+    rows = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before is None:
+            rows.append((name, None, result['min'], None, 'new'))
+            continue
+        ratio = result['min'] / before['min']
+        if ratio > 1 + threshold:
+            status = 'regressed'
+        elif ratio < 1 / (1 + threshold):
+            status = 'improved'
+        else:
+            status = 'ok'
+        rows.append((name, before['min'], result['min'], ratio, status))
+    return rows
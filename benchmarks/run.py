@@ -0,0 +1,91 @@
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import sys
+import time
+
+# Must be set before Qt is first imported
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from benchmarks.harness import BENCHMARKS, compare, run
+import benchmarks.engine  # noqa: F401 - registers the engine benchmarks
+
+
+def load_gui():
+    # The GUI benchmarks need PyQt5; the engine ones still run without it
+    try:
+        import benchmarks.gui  # noqa: F401
+    except ImportError as error:
+        print(f"Skipping GUI benchmarks: {error}", file=sys.stderr)
+
+
+def select(patterns):
+    if not patterns:
+        return list(BENCHMARKS)
+    return [name for name in BENCHMARKS
+            if any(fnmatch.fnmatch(name, pattern) or BENCHMARKS[name][0] == pattern
+                   for pattern in patterns)]
+
+
+def format_time(seconds):
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def print_result(name, result):
+    print(f"{name:40} {format_time(result['min']):>10} min  {format_time(result['median']):>10} median"
+          f"  ({result['number']} loops x {result['repeat']})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the engine and GUI hot paths")
+    parser.add_argument('patterns', nargs='*',
+                        help="benchmark names, glob patterns or groups to run (default: all)")
+    parser.add_argument('--list', action='store_true', help="list the benchmarks and exit")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--min-time', type=float, default=0.05, help="seconds per timed repeat")
+    parser.add_argument('--json', help="write the results to this file")
+    parser.add_argument('--compare', help="baseline results file to check for regressions")
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help="slowdown that counts as a regression (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    load_gui()
+    names = select(args.patterns)
+    if args.list:
+        for name in names:
+            print(f"{name:40} {BENCHMARKS[name][0]}")
+        return
+
+    results = run(names, args.repeat, args.min_time, report=print_result)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({
+                'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+                'benchmarks': results,
+            }, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['benchmarks']
+        rows = compare(results, baseline, args.threshold)
+        print()
+        for name, before, after, ratio, status in rows:
+            if ratio is None:
+                print(f"{name:40} {'':>10}     {format_time(after):>10}  {status}")
+            else:
+                print(f"{name:40} {format_time(before):>10} ->  {format_time(after):>10}  x{ratio:.2f} {status}")
+        regressions = [row[0] for row in rows if row[4] == 'regressed']
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
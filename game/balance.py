@@ -0,0 +1,201 @@
+import argparse
+import time
+import numpy as np
+from models.character import (
+    CHARACTER_CLASSES as CLASSES, create_bosses,
+    cersei_ability, night_king_ability, dragon_ability
+)
+
+# Outcome codes stored per fight
+ONGOING, WIN, LOSS, FLED, TIMEOUT = 0, 1, 2, 3, 4
+
+# Same action set as game.combat.CombatEngine.step
+DEFAULT_POLICY = {'attack': 0.8, 'defend': 0.1, 'flee': 0.0, 'boss_ability': 0.1}
+
+
+class Fights:
+    # Struct-of-arrays state for the fights that are still running. Stats never
+    # change mid-fight, so per-hit damage is derived from them once per batch.
+    def __init__(self, n, player, boss, kernel=None):
+        self.player_hp = np.full(n, player.health, dtype=np.int16)
+        self.boss_hp = np.full(n, boss.health, dtype=np.int16)
+        self.defending = np.zeros(n, dtype=bool)
+        player_str = np.full(n, player.strength, dtype=np.int16)
+        player_def = np.full(n, player.defense, dtype=np.int16)
+        boss_str = np.full(n, boss.strength, dtype=np.int16)
+        boss_int = np.full(n, boss.intelligence, dtype=np.int16)
+        boss_def = np.full(n, boss.defense, dtype=np.int16)
+        self.player_damage = np.maximum(1, player_str - boss_def)
+        self.enemy_damage = np.maximum(1, boss_str - player_def)
+        self.defended_damage = np.maximum(1, boss_str // 2 - player_def)
+        self.ability_damage = np.zeros(n, dtype=np.int16)
+        self.ability_heal = np.zeros(n, dtype=np.int16)
+        if kernel is not None:
+            self.ability_damage[:], self.ability_heal[:] = kernel(boss_str, boss_int)
+
+    def compact(self, keep):
+        for name, values in vars(self).items():
+            setattr(self, name, values[keep])
+
+
+# Vectorized counterparts of the scalar boss abilities in models.character.
+# Each returns (damage dealt to the player, health healed by the boss).
+def cersei_kernel(strength, intelligence):
+    return intelligence * 2, 0
+
+
+def night_king_kernel(strength, intelligence):
+    return 0, 20
+
+
+def dragon_kernel(strength, intelligence):
+    return strength * 3, 0
+
+
+ABILITY_KERNELS = {
+    cersei_ability: cersei_kernel,
+    night_king_ability: night_king_kernel,
+    dragon_ability: dragon_kernel,
+}
+
+
+class BalanceReport:
+    def __init__(self, player, boss, outcome, turns, hp_left):
+        self.player = player
+        self.boss = boss
+        self.fights = len(outcome)
+        self.win_rate = float(np.mean(outcome == WIN))
+        self.loss_rate = float(np.mean(outcome == LOSS))
+        self.flee_rate = float(np.mean(outcome == FLED))
+        self.timeout_rate = float(np.mean(outcome == TIMEOUT))
+        won = outcome == WIN
+        self.turns_to_kill = np.bincount(turns[won]) if won.any() else np.zeros(0, dtype=np.int64)
+        self.mean_turns_to_kill = float(turns[won].mean()) if won.any() else float('nan')
+        self.hp_left = np.percentile(hp_left[won], [10, 50, 90]) if won.any() else np.full(3, np.nan)
+
+    def summary(self):
+        return (f"{self.player.__class__.__name__} (STR {self.player.strength}, DEF {self.player.defense}) "
+                f"vs {self.boss.name}: win {self.win_rate:.1%}, loss {self.loss_rate:.1%}, "
+                f"fled {self.flee_rate:.1%}, timeout {self.timeout_rate:.1%}, "
+                f"turns to kill {self.mean_turns_to_kill:.1f}, "
+                f"HP left p10/p50/p90 {self.hp_left[0]:.0f}/{self.hp_left[1]:.0f}/{self.hp_left[2]:.0f}")
+
+
+def simulate(player, boss, fights=1_000_000, policy=None, max_turns=200, seed=None,
+             batch_size=1 << 16):
+    rng = np.random.default_rng(seed)
+    weights = np.array([(policy or DEFAULT_POLICY).get(action, 0.0)
+                        for action in ('attack', 'defend', 'flee', 'boss_ability')])
+    thresholds = np.cumsum(weights / weights.sum())
+    kernel = ABILITY_KERNELS.get(getattr(boss, 'special_ability', None))
+
+    outcome = np.zeros(fights, dtype=np.int8)
+    turns = np.zeros(fights, dtype=np.int16)
+    hp_left = np.zeros(fights, dtype=np.int16)
+
+    for start in range(0, fights, batch_size):
+        n = min(batch_size, fights - start)
+        state = Fights(n, player, boss, kernel)
+        index = np.arange(start, start + n)
+        active = np.ones(n, dtype=bool)
+        for turn in range(1, max_turns + 1):
+            roll = rng.random(len(index), dtype=np.float32)
+            state.boss_hp -= np.where(roll < thresholds[0], state.player_damage, 0)
+            state.defending |= (roll >= thresholds[0]) & (roll < thresholds[1])
+            if weights[2]:
+                fled = (roll >= thresholds[1]) & (roll < thresholds[2])
+                fled &= rng.random(len(index), dtype=np.float32) < 0.5
+            else:
+                fled = np.zeros(len(index), dtype=bool)
+            if kernel is not None and weights[3]:
+                ability = roll >= thresholds[2]
+                state.player_hp -= np.where(ability, state.ability_damage, 0)
+                state.boss_hp += np.where(ability, state.ability_heal, 0)
+
+            enemy_acts = ~fled & (state.boss_hp > 0) & (state.player_hp > 0)
+            damage = np.where(state.defending, state.defended_damage, state.enemy_damage)
+            state.player_hp -= damage * enemy_acts
+            state.defending &= ~enemy_acts
+
+            result = np.zeros(len(index), dtype=np.int8)
+            result[fled] = FLED
+            result[state.boss_hp <= 0] = WIN
+            result[state.player_hp <= 0] = LOSS
+            if turn == max_turns:
+                result[result == ONGOING] = TIMEOUT
+
+            done = (result != ONGOING) & active
+            if done.any():
+                finished = index[done]
+                outcome[finished] = result[done]
+                turns[finished] = turn
+                hp_left[finished] = np.maximum(0, state.player_hp[done])
+                active &= ~done
+                live = np.count_nonzero(active)
+                if not live:
+                    break
+                # Copying every array each turn costs more than carrying a few
+                # finished fights along, so only drop them in bulk.
+                if live < len(index) * 3 // 4:
+                    index = index[active]
+                    state.compact(active)
+                    active = np.ones(live, dtype=bool)
+
+    return BalanceReport(player, boss, outcome, turns, hp_left)
+
+
+def sweep(class_name, boss, strengths, defenses, fights=100_000, **kwargs):
+    reports = []
+    for strength in strengths:
+        for defense in defenses:
+            player = CLASSES[class_name]("Simulated", None)
+            player.strength = strength
+            player.defense = defense
+            reports.append(simulate(player, boss, fights, **kwargs))
+    return reports
+
+
+def parse_range(text):
+    if ':' in text:
+        low, high = text.split(':')
+        return range(int(low), int(high) + 1)
+    return [int(text)]
+
+
+def main():
+    bosses = create_bosses()
+    parser = argparse.ArgumentParser(description="Monte Carlo class vs boss balance simulator")
+    parser.add_argument('--class', dest='class_name', choices=CLASSES, default='Warrior')
+    parser.add_argument('--boss', choices=[boss.name for boss in bosses], default=bosses[0].name)
+    parser.add_argument('--fights', type=int, default=1_000_000)
+    parser.add_argument('--strength', help="value or low:high range (defaults to class stat)")
+    parser.add_argument('--defense', help="value or low:high range (defaults to class stat)")
+    parser.add_argument('--ability-chance', type=float, default=DEFAULT_POLICY['boss_ability'])
+    parser.add_argument('--flee-chance', type=float, default=DEFAULT_POLICY['flee'])
+    parser.add_argument('--defend-chance', type=float, default=DEFAULT_POLICY['defend'])
+    parser.add_argument('--seed', type=int)
+    args = parser.parse_args()
+
+    boss = next(boss for boss in bosses if boss.name == args.boss)
+    template = CLASSES[args.class_name]("Simulated", None)
+    strengths = parse_range(args.strength) if args.strength else [template.strength]
+    defenses = parse_range(args.defense) if args.defense else [template.defense]
+    policy = {
+        'attack': max(0.0, 1.0 - args.ability_chance - args.flee_chance - args.defend_chance),
+        'defend': args.defend_chance,
+        'flee': args.flee_chance,
+        'boss_ability': args.ability_chance,
+    }
+
+    started = time.perf_counter()
+    reports = sweep(args.class_name, boss, strengths, defenses, args.fights,
+                    policy=policy, seed=args.seed)
+    elapsed = time.perf_counter() - started
+    for report in reports:
+        print(report.summary())
+    total = args.fights * len(reports)
+    print(f"Simulated {total} fights in {elapsed:.2f}s ({total / elapsed:,.0f} fights/s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+import random
+from collections import namedtuple
+from models.character import Boss
+
+# One entry per thing that happened in a turn; the GUI only renders these.
+TurnRecord = namedtuple("TurnRecord", ["turn", "actor", "action", "amount", "message"])
+CombatResult = namedtuple("CombatResult", ["winner", "turns", "fled", "reward", "records"])
+
+ACTIONS = ('attack', 'defend', 'use_item', 'flee', 'boss_ability')
+
+
+# Policies pick the player's next action so a fight can be resolved unattended
+def attack_policy(engine):
+    return 'attack'
+
+
+def cautious_policy(engine):
+    if engine.player.health < 30:
+        return 'flee'
+    return 'attack'
+
+
+def defensive_policy(engine):
+    # Alternate attacking and bracing once the fight turns ugly
+    if engine.player.health < 50 and engine.turn % 2 == 0:
+        return 'defend'
+    return 'attack'
+
+
+POLICIES = {'Attack': attack_policy, 'Cautious': cautious_policy, 'Defensive': defensive_policy}
+
+
+class CombatEngine:
+    def __init__(self, player, enemy, rng=None, record=True):
+        self.player = player
+        self.enemy = enemy
+        self.rng = rng or random
+        self.record = record
+        self.turn = 0
+        self.fled = False
+        self.winner = None
+        self.reward = 0
+        self.records = []
+
+    @property
+    def finished(self):
+        return self.fled or self.winner is not None
+
+    def step(self, action, item=None):
+        if self.finished:
+            return []
+        if action not in ACTIONS:
+            raise ValueError(f"Unknown combat action: {action}")
+        self.turn += 1
+        start = len(self.records)
+
+        if action == 'attack':
+            self.player_attack()
+        elif action == 'defend':
+            self.player_defend()
+        elif action == 'use_item':
+            self.use_item(item)
+        elif action == 'flee':
+            self.flee()
+        elif action == 'boss_ability':
+            self.use_boss_ability()
+
+        if not self.fled and self.enemy.is_alive() and self.player.is_alive():
+            self.enemy_turn()
+        self.check_combat_end()
+
+        if self.record:
+            return self.records[start:]
+        return []
+
+    def resolve(self, policy=attack_policy, max_turns=1000):
+        while not self.finished and self.turn < max_turns:
+            self.step(policy(self))
+        return self.result()
+
+    def result(self):
+        return CombatResult(self.winner, self.turn, self.fled, self.reward, self.records)
+
+    def summary(self):
+        player, enemy = self.player.name, self.enemy.name
+        turns = f"{self.turn} turn{'s' if self.turn != 1 else ''}"
+        if self.fled:
+            return f"{player} escaped from {enemy} after {turns}."
+        if self.winner is self.player:
+            return f"{player} defeated {enemy} in {turns} and earned {self.reward} gold."
+        if self.winner is self.enemy:
+            return f"{player} was defeated by {enemy} after {turns}."
+        return f"The fight with {enemy} is still going after {turns}."
+
+    def log(self, actor, action, amount, message):
+        if self.record:
+            self.records.append(TurnRecord(self.turn, actor, action, amount, message))
+
+    def player_attack(self):
+        damage = max(1, self.player.strength - self.enemy.defense)
+        self.enemy.take_damage(damage)
+        self.log(self.player, 'attack', damage, f"{self.player.name} attacks for {damage} damage!")
+
+    def player_defend(self):
+        self.player.defending = True
+        self.log(self.player, 'defend', 0, f"{self.player.name} takes a defensive stance.")
+
+    def use_item(self, item):
+        if item is None or not self.player.inventory.remove_item(item):
+            self.log(self.player, 'use_item', 0, "No usable items in inventory!")
+            return
+        item.use(self.player)
+        self.log(self.player, 'use_item', 0, f"Used {item.name}")
+
+    def flee(self):
+        if self.rng.random() < 0.5:
+            self.fled = True
+            self.log(self.player, 'flee', 1, f"{self.player.name} successfully fled from combat!")
+        else:
+            self.log(self.player, 'flee', 0, f"{self.player.name} failed to flee!")
+
+    def use_boss_ability(self):
+        if isinstance(self.enemy, Boss):
+            message = self.enemy.use_special_ability(self.player)
+            self.log(self.enemy, 'boss_ability', 0, message)
+
+    def enemy_turn(self):
+        if self.player.defending:
+            damage = max(1, (self.enemy.strength // 2) - self.player.defense)
+            self.player.defending = False
+        else:
+            damage = max(1, self.enemy.strength - self.player.defense)
+        self.player.take_damage(damage)
+        self.log(self.enemy, 'attack', damage, f"{self.enemy.name} attacks for {damage} damage!")
+
+    def check_combat_end(self):
+        if not self.player.is_alive():
+            self.log(self.player, 'defeated', 0, f"{self.player.name} has been defeated!")
+            self.winner = self.enemy
+        elif not self.enemy.is_alive():
+            self.log(self.enemy, 'defeated', 0, f"{self.enemy.name} has been defeated!")
+            self.winner = self.player
+            self.reward = self.rng.randint(10, 50)
+            self.player.earn_gold(self.reward)
+            self.log(self.player, 'reward', self.reward,
+                     f"{self.player.name} wins! Earned {self.reward} gold.")
@@ -0,0 +1,275 @@
+from game.items import get_item
+
+# Draws from a table's sampler are redrawn this many times when they land on
+# an event that is cooling down or whose conditions fail, before falling
+# back to a pass over the table
+MAX_REDRAWS = 8
+
+
+class HealthBelow:
+    def __init__(self, value):
+        self.value = value
+
+    def is_met(self, player):
+        return player.health < self.value
+
+
+class GoldAtLeast:
+    def __init__(self, value):
+        self.value = value
+
+    def is_met(self, player):
+        return player.gold >= self.value
+
+
+class LacksItem:
+    def __init__(self, item_name):
+        self.item_name = item_name
+
+    def is_met(self, player):
+        return self.item_name not in player.inventory
+
+
+class GoldEffect:
+    def __init__(self, amount):
+        self.amount = amount
+
+    def apply(self, session):
+        session.player.earn_gold(self.amount)
+
+
+class ItemEffect:
+    def __init__(self, item_name):
+        self.item = get_item(item_name)
+
+    def apply(self, session):
+        session.player.inventory.add_item(self.item)
+
+
+class HealEffect:
+    def __init__(self, amount):
+        self.amount = amount
+
+    def apply(self, session):
+        session.player.health = min(100, session.player.health + self.amount)
+
+
+class AmbushEffect:
+    def __init__(self, enemy_name):
+        self.enemy_name = enemy_name
+
+    def apply(self, session):
+        session.ambush(session.roll_enemy(self.enemy_name))
+
+
+CONDITION_TYPES = {'health_below': HealthBelow, 'gold_at_least': GoldAtLeast, 'lacks_item': LacksItem}
+EFFECT_TYPES = {'gold': GoldEffect, 'item': ItemEffect, 'heal': HealEffect, 'ambush': AmbushEffect}
+
+# Event content. A cooldown is the number of event checks (steps) before the
+# same event can happen again, and every condition must hold for it to fire.
+EVENT_DATA = [
+    {'name': "Bag of Gold",
+     'message': "You find a bag of gold!",
+     'effects': [('gold', 50)]},
+    {'name': "Bandit Ambush",
+     'message': "You are ambushed by bandits!",
+     'effects': [('ambush', "Bandit")]},
+    {'name': "Ancient Artifact",
+     'message': "You discover an ancient artifact!",
+     'effects': [('item', "Ancient Artifact")]},
+    {'name': "Kind Stranger",
+     'message': "A kind stranger offers you food and rest.",
+     'effects': [('heal', 10)]},
+]
+
+# Weighted event tables. 'chance' is how likely a step is to roll an event
+# at all; a table that 'extends' another starts from its events and chance.
+TABLE_DATA = {
+    'default': {'chance': 0.3,
+                'events': {"Bag of Gold": 1, "Bandit Ambush": 1, "Ancient Artifact": 1,
+                           "Kind Stranger": 1}},
+}
+
+# Regions group locations under one table; single locations can override it
+REGION_DATA = {}
+LOCATION_TABLES = {}
+DEFAULT_TABLE = 'default'
+
+
+class Event:
+    __slots__ = ('name', 'message', 'effects', 'conditions', 'cooldown')
+
+    def __init__(self, name, message, effects, conditions=(), cooldown=0):
+        self.name = name
+        self.message = message
+        self.effects = effects
+        self.conditions = conditions
+        self.cooldown = cooldown
+
+    def is_possible(self, player):
+        return all(condition.is_met(player) for condition in self.conditions)
+
+    def apply(self, session):
+        for effect in self.effects:
+            effect.apply(session)
+
+
+class AliasSampler:
+    # Vose's alias method: one uniform draw picks a column, and the fraction
+    # left over decides between the column's own event and its alias
+    def __init__(self, weights):
+        count = len(weights)
+        total = sum(weights)
+        if count == 0 or total <= 0:
+            raise ValueError("An alias sampler needs at least one positive weight")
+        scaled = [weight * count / total for weight in weights]
+        self.probability = [1.0] * count
+        self.alias = list(range(count))
+        small = [index for index, value in enumerate(scaled) if value < 1.0]
+        large = [index for index, value in enumerate(scaled) if value >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.probability[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            (small if scaled[more] < 1.0 else large).append(more)
+        # Whatever is left is 1.0 up to rounding
+        self.count = count
+
+    def sample(self, rng):
+        draw = rng.random() * self.count
+        column = int(draw)
+        if draw - column < self.probability[column]:
+            return column
+        return self.alias[column]
+
+
+class EventTable:
+    __slots__ = ('name', 'chance', 'events', 'weights', 'sampler')
+
+    def __init__(self, name, chance, events, weights):
+        self.name = name
+        self.chance = chance
+        self.events = events
+        self.weights = weights
+        self.sampler = AliasSampler(weights) if events else None
+
+    def sample(self, rng):
+        return self.events[self.sampler.sample(rng)]
+
+
+class EventCatalog:
+    # Event content plus which table each location uses. Tables are compiled
+    # into samplers the first time they are needed and kept until the
+    # content changes, so a step costs the same however large the catalog is.
+    def __init__(self, event_data=(), table_data=None, region_data=None, location_tables=None,
+                 default_table=None):
+        self.events = {}
+        self.tables = {}
+        self.location_tables = {}
+        self.default_table = default_table
+        self.version = 0
+        self.compiled = {}
+        self.compiled_version = None
+        for entry in event_data:
+            self.add_event(entry)
+        for name, entry in (table_data or {}).items():
+            self.set_table(name, entry)
+        for table, locations in (region_data or {}).items():
+            for location in locations:
+                self.assign(location, table)
+        for location, table in (location_tables or {}).items():
+            self.assign(location, table)
+
+    def add_event(self, entry):
+        conditions = tuple(CONDITION_TYPES[kind](*args) for kind, *args in entry.get('conditions', ()))
+        effects = tuple(EFFECT_TYPES[kind](*args) for kind, *args in entry['effects'])
+        self.events[entry['name']] = Event(entry['name'], entry['message'], effects, conditions,
+                                           entry.get('cooldown', 0))
+        self.version += 1
+
+    def set_table(self, name, entry):
+        self.tables[name] = entry
+        self.version += 1
+
+    def assign(self, location_name, table_name):
+        self.location_tables[location_name] = table_name
+        self.version += 1
+
+    def table_for(self, location_name):
+        if self.compiled_version != self.version:
+            self.compiled.clear()
+            self.compiled_version = self.version
+        name = self.location_tables.get(location_name, self.default_table)
+        if name is None:
+            return None
+        table = self.compiled.get(name)
+        if table is None:
+            table = self.compiled[name] = self.compile(name)
+        return table
+
+    def compile(self, name):
+        chance, weights = self.resolve(name, ())
+        events = [self.events[event_name] for event_name, weight in weights.items() if weight > 0]
+        return EventTable(name, chance, events, [weights[event.name] for event in events])
+
+    def resolve(self, name, seen):
+        if name in seen:
+            raise ValueError(f"Event table {name!r} extends itself")
+        if name not in self.tables:
+            raise ValueError(f"Unknown event table {name!r}")
+        entry = self.tables[name]
+        chance, weights = 0.0, {}
+        if 'extends' in entry:
+            chance, weights = self.resolve(entry['extends'], seen + (name,))
+            weights = dict(weights)
+        for event_name, weight in entry.get('events', {}).items():
+            if event_name not in self.events:
+                raise ValueError(f"Event table {name!r} uses unknown event {event_name!r}")
+            weights[event_name] = weight
+        return entry.get('chance', chance), weights
+
+
+EVENTS = EventCatalog(EVENT_DATA, TABLE_DATA, REGION_DATA, LOCATION_TABLES, DEFAULT_TABLE)
+
+
+class EventDirector:
+    # One per session: rolls for an event on every step and remembers when
+    # each event on cooldown may fire again
+    def __init__(self, catalog=EVENTS):
+        self.catalog = catalog
+        self.checks = 0
+        self.ready_at = {}  # event name -> check from which it may fire again
+
+    def is_available(self, event, player):
+        return self.ready_at.get(event.name, 0) <= self.checks and event.is_possible(player)
+
+    def draw(self, location, player, rng):
+        self.checks += 1
+        table = self.catalog.table_for(location.name)
+        if table is None or not table.events or rng.random() >= table.chance:
+            return None
+        for _ in range(MAX_REDRAWS):
+            event = table.sample(rng)
+            if self.is_available(event, player):
+                break
+        else:
+            event = self.fallback(table, player, rng)
+            if event is None:
+                return None
+        if event.cooldown:
+            self.ready_at[event.name] = self.checks + event.cooldown + 1
+        return event
+
+    def fallback(self, table, player, rng):
+        # Most of the table is ruled out; pick by weight among what is left
+        available = [(event, weight) for event, weight in zip(table.events, table.weights)
+                     if self.is_available(event, player)]
+        if not available:
+            return None
+        draw = rng.random() * sum(weight for event, weight in available)
+        for event, weight in available:
+            draw -= weight
+            if draw < 0:
+                return event
+        return available[-1][0]
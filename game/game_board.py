@@ -1,103 +1,153 @@
 import random
-from models.character import NPC, bosses
+from game.spatial import SpatialHash
+from models.character import NPC, create_bosses
 
 class Location:
-    def __init__(self, name, color, event_probability=0.3, npcs=None):
+    # Random events come from the location's table in game.events
+    __slots__ = ('name', 'color', 'npcs', 'boss')
+
+    def __init__(self, name, color, npcs=None):
         self.name = name
         self.color = color
-        self.event_probability = event_probability
         self.npcs = npcs or []
         self.boss = None
 
-    def trigger_event(self):
-        return random.random() < self.event_probability
+
+def create_locations():
+    return [
+        Location("Winterfell", "#444444", npcs=[
+            NPC("Stark Steward", "Merchant"),
+            NPC("Maester Luwin", "Innkeeper"),
+            NPC("Ser Rodrik Cassel", "Guard")
+        ]),
+        Location("King's Landing", "#f1c232", npcs=[
+            NPC("Street Vendor", "Merchant"),
+            NPC("Tavern Keeper", "Innkeeper"),
+            NPC("City Watch Guard", "Guard")
+        ]),
+        Location("The Wall", "#fffafa", npcs=[
+            NPC("Night's Watch Steward", "Merchant"),
+            NPC("Castle Black Cook", "Innkeeper"),
+            NPC("Night's Watch Ranger", "Guard")
+        ]),
+        Location("Dragonstone", "#6a329f", npcs=[
+            NPC("Smuggler", "Merchant"),
+            NPC("Dragonstone Servant", "Innkeeper")
+        ]),
+        Location("Riverrun", "#2986cc", npcs=[
+            NPC("Tully Merchant", "Merchant"),
+            NPC("Riverrun Innkeeper", "Innkeeper"),
+            NPC("Tully Guard", "Guard")
+        ]),
+        Location("The Eyrie", "skyblue", npcs=[
+            NPC("Vale Trader", "Merchant"),
+            NPC("Eyrie Steward", "Innkeeper"),
+            NPC("Knight of the Vale", "Guard")
+        ]),
+        Location("Casterly Rock", "#990000", npcs=[
+            NPC("Lannister Merchant", "Merchant"),
+            NPC("Golden Tooth Innkeeper", "Innkeeper"),
+            NPC("Lannister Guard", "Guard")
+        ]),
+        Location("Highgarden", "#a64d79", npcs=[
+            NPC("Reach Trader", "Merchant"),
+            NPC("Highgarden Servant", "Innkeeper"),
+            NPC("Tyrell Guard", "Guard")
+        ]),
+        Location("Dorne", "#ffe599", npcs=[
+            NPC("Dornish Merchant", "Merchant"),
+            NPC("Sunspear Innkeeper", "Innkeeper"),
+            NPC("Martell Guard", "Guard")
+        ]),
+        Location("Iron Islands", "#999999", npcs=[
+            NPC("Ironborn Trader", "Merchant"),
+            NPC("Pyke Servant", "Innkeeper"),
+            NPC("Ironborn Warrior", "Guard")
+        ])
+    ]
+
+
+def assign_bosses(locations, bosses):
+    boss_locations = {
+        "King's Landing": bosses[0],  # Cersei
+        "The Wall": bosses[1],        # Night King
+        "Dragonstone": bosses[2]      # Drogon
+    }
+    for location in locations:
+        if location.name in boss_locations:
+            location.boss = boss_locations[location.name]
 
 
 class GameBoard:
-    def __init__(self, size=10):
+    def __init__(self, size=10, sparse=False, rng=None):
         self.size = size
-        self.locations = [
-            Location("Winterfell", "#444444", npcs=[
-                NPC("Stark Steward", "Merchant"),
-                NPC("Maester Luwin", "Innkeeper"),
-                NPC("Ser Rodrik Cassel", "Guard")
-            ]),
-            Location("King's Landing", "#f1c232", npcs=[
-                NPC("Street Vendor", "Merchant"),
-                NPC("Tavern Keeper", "Innkeeper"),
-                NPC("City Watch Guard", "Guard")
-            ]),
-            Location("The Wall", "#fffafa", npcs=[
-                NPC("Night's Watch Steward", "Merchant"),
-                NPC("Castle Black Cook", "Innkeeper"),
-                NPC("Night's Watch Ranger", "Guard")
-            ]),
-            Location("Dragonstone", "#6a329f", npcs=[
-                NPC("Smuggler", "Merchant"),
-                NPC("Dragonstone Servant", "Innkeeper")
-            ]),
-            Location("Riverrun", "#2986cc", npcs=[
-                NPC("Tully Merchant", "Merchant"),
-                NPC("Riverrun Innkeeper", "Innkeeper"),
-                NPC("Tully Guard", "Guard")
-            ]),
-            Location("The Eyrie", "skyblue", npcs=[
-                NPC("Vale Trader", "Merchant"),
-                NPC("Eyrie Steward", "Innkeeper"),
-                NPC("Knight of the Vale", "Guard")
-            ]),
-            Location("Casterly Rock", "#990000", npcs=[
-                NPC("Lannister Merchant", "Merchant"),
-                NPC("Golden Tooth Innkeeper", "Innkeeper"),
-                NPC("Lannister Guard", "Guard")
-            ]),
-            Location("Highgarden", "#a64d79", npcs=[
-                NPC("Reach Trader", "Merchant"),
-                NPC("Highgarden Servant", "Innkeeper"),
-                NPC("Tyrell Guard", "Guard")
-            ]),
-            Location("Dorne", "#ffe599", npcs=[
-                NPC("Dornish Merchant", "Merchant"),
-                NPC("Sunspear Innkeeper", "Innkeeper"),
-                NPC("Martell Guard", "Guard")
-            ]),
-            Location("Iron Islands", "#999999", npcs=[
-                NPC("Ironborn Trader", "Merchant"),
-                NPC("Pyke Servant", "Innkeeper"),
-                NPC("Ironborn Warrior", "Guard")
-            ])
-        ]
+        self.rng = rng or random
+        # Sparse boards keep only the named tiles; everything else is wilderness
+        self.sparse = sparse
+        self.tiles = {}
+        self.version = 0  # Bumped whenever the layout changes
+        self.locations = create_locations()
         self.wilderness = Location("Wilderness", "#4a6741")
+        self.bosses = create_bosses()
+        self.npcs = SpatialHash()
         self.board = self.generate_board()
         self.place_bosses()
+        self.place_npcs()
 
     def generate_board(self):
-        board = [[self.wilderness for _ in range(self.size)] for _ in range(self.size)]
-        available_positions = [(x, y) for x in range(self.size) for y in range(self.size)]
-        
-        for location in self.locations:
-            if available_positions:
-                x, y = random.choice(available_positions)
-                board[y][x] = location
-                available_positions.remove((x, y))
-            else:
-                break  # No more available positions
-        
+        # Sampling from a range picks distinct cells without listing every coordinate
+        cells = self.rng.sample(range(self.size * self.size), min(len(self.locations), self.size * self.size))
+        self.tiles = {(cell % self.size, cell // self.size): location
+                      for location, cell in zip(self.locations, cells)}
+        self.version += 1
+        return self.build_grid()
+
+    def build_grid(self):
+        if self.sparse:
+            return None
+
+        # Repeating a one-element list copies references in C, far faster than a comprehension
+        board = [[self.wilderness] * self.size for _ in range(self.size)]
+        for (x, y), location in self.tiles.items():
+            board[y][x] = location
         return board
 
+    def restore_tiles(self, tiles):
+        self.tiles = dict(tiles)
+        self.version += 1
+        self.board = self.build_grid()
+        self.place_bosses()
+        self.place_npcs()
+
     def get_location(self, x, y):
+        if self.board is None:
+            return self.tiles.get((x, y), self.wilderness)
         return self.board[y][x]
 
+    def named_positions(self):
+        return dict(self.tiles)
 
     def place_bosses(self):
-        boss_locations = {
-            "King's Landing": bosses[0],  # Cersei
-            "The Wall": bosses[1],        # Night King
-            "Dragonstone": bosses[2]      # Drogon
-        }
-        for y in range(self.size):
-            for x in range(self.size):
-                location = self.board[y][x]
-                if location.name in boss_locations:
-                    location.boss = boss_locations[location.name]
+        assign_bosses(self.tiles.values(), self.bosses)
+
+    def place_npcs(self):
+        # Each location's residents stand on its tile
+        self.npcs = SpatialHash()
+        for position, location in self.tiles.items():
+            for npc in location.npcs:
+                self.npcs.insert(npc, position)
+
+    def add_npc(self, npc, position):
+        self.npcs.insert(npc, position)
+
+    def move_npc(self, npc, position):
+        self.npcs.move(npc, position)
+
+    def remove_npc(self, npc):
+        self.npcs.remove(npc)
+
+    def npcs_at(self, x, y):
+        return self.npcs.at(x, y)
 
+    def npcs_near(self, x, y, radius):
+        return self.npcs.near(x, y, radius)
@@ -0,0 +1,60 @@
+from models.inventory import Item
+
+
+def restore_health(amount):
+    def effect(player):
+        player.health = min(100, player.health + amount)
+    return effect
+
+
+def raise_stat(stat, amount):
+    def effect(player):
+        setattr(player, stat, getattr(player, stat) + amount)
+    return effect
+
+
+def no_effect(player):
+    pass
+
+
+# Every item the game can hand out. Ids are what saves store, so an item
+# keeps its id forever; new items get new ids.
+ITEM_DATA = [
+    (1, "Health Potion", 50, restore_health(30)),
+    (2, "Strength Potion", 100, raise_stat('strength', 5)),
+    (3, "Shield", 150, raise_stat('defense', 5)),
+    (4, "Dragon Egg", 1000, no_effect),
+    (5, "Rare Book", 100, no_effect),
+    (6, "Ancient Artifact", 200, no_effect),
+    (7, "Bandit's Emblem", 25, no_effect),
+]
+
+MERCHANT_STOCK = ["Health Potion", "Strength Potion", "Shield"]
+
+
+def load_catalog(item_data):
+    by_id = {}
+    by_name = {}
+    for item_id, name, value, effect in item_data:
+        if item_id in by_id or name in by_name:
+            raise ValueError(f"Duplicate item in catalog: {item_id} {name!r}")
+        item = Item(name, value, effect, id=item_id)
+        by_id[item_id] = by_name[name] = item
+    return by_id, by_name
+
+
+# Built once; inventories, merchants and rewards all hold references to these
+ITEMS_BY_ID, ITEMS = load_catalog(ITEM_DATA)
+MERCHANT_ITEMS = tuple(ITEMS[name] for name in MERCHANT_STOCK)
+
+
+def get_item(name):
+    return ITEMS[name]
+
+
+def item_by_id(item_id):
+    return ITEMS_BY_ID[item_id]
+
+
+def merchant_stock():
+    return MERCHANT_ITEMS
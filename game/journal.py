@@ -0,0 +1,40 @@
+import json
+
+JOURNAL_VERSION = 2
+
+
+class Journal:
+    # Append-only log of player actions; the header holds everything needed to
+    # rebuild the starting state (seed, board and character)
+    def __init__(self, path=None):
+        self.path = path
+        self.header = None
+        self.entries = []
+        self.file = None
+
+    def start(self, header):
+        self.header = dict(header, version=JOURNAL_VERSION)
+        if self.path is not None:
+            self.file = open(self.path, 'w', buffering=1)
+            self.file.write(json.dumps(self.header) + "\n")
+
+    def record(self, action, *args):
+        entry = [action, *args]
+        self.entries.append(entry)
+        if self.file is not None:
+            self.file.write(json.dumps(entry) + "\n")
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    @classmethod
+    def load(cls, path):
+        journal = cls()
+        with open(path) as f:
+            journal.header = json.loads(f.readline())
+            if journal.header.get('version') != JOURNAL_VERSION:
+                raise ValueError(f"Unsupported journal version: {journal.header.get('version')}")
+            journal.entries = [json.loads(line) for line in f if line.strip()]
+        return journal
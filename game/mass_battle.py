@@ -0,0 +1,163 @@
+from collections import namedtuple
+import numpy as np
+from models.character import cersei_ability, night_king_ability, dragon_ability
+from models.entity_store import EntityStore
+
+BattleResult = namedtuple("BattleResult", ["winner", "rounds", "survivors", "casualties", "raised", "summary"])
+
+
+class Army:
+    # One side of a mass battle. Rank-and-file units live in an EntityStore;
+    # bosses leading the army are units too, remembered so they can use their
+    # abilities and so their health is written back after the battle.
+    def __init__(self, name):
+        self.name = name
+        self.units = EntityStore()
+        self.leaders = {}  # store index -> Boss
+        self.mustered = 0
+        self.raised = 0
+
+    def __len__(self):
+        return len(self.units.alive())
+
+    def recruit(self, template, count, rng, spread=2):
+        # Copies of a Character's stats, each stat jittered by up to +-spread
+        def roll(value, low=0):
+            return np.maximum(low, value + rng.integers(-spread, spread + 1, count))
+        self.units.add_many(count,
+                            strength=roll(template.strength, 1),
+                            intelligence=roll(template.intelligence),
+                            charisma=roll(template.charisma),
+                            defense=roll(template.defense),
+                            health=template.health)
+        self.mustered += count
+
+    def add_leader(self, boss):
+        index = self.units.add_character(boss)
+        self.leaders[index] = boss
+        self.mustered += 1
+        return index
+
+
+# Mass-battle versions of the boss abilities in models.character. Each gets
+# the battle, the boss's army, the enemy army, the boss's unit index and the
+# units of both sides that fell this round.
+def wildfire(battle, army, enemy, index, fallen):
+    targets = battle.pick(enemy.units.alive(), battle.splash)
+    enemy.units.damage(targets, army.units.intelligence[index] * 2)
+
+
+def dragonfire(battle, army, enemy, index, fallen):
+    targets = battle.pick(enemy.units.alive(), battle.splash)
+    enemy.units.damage(targets, army.units.strength[index] * 3)
+
+
+def raise_dead(battle, army, enemy, index, fallen):
+    army.units.heal([index], 20, limit=army.leaders[index].max_health)
+    dead = fallen[enemy.name]
+    if not len(dead):
+        return
+    dead = battle.pick(dead, battle.raise_limit)
+    units = enemy.units
+    army.units.add_many(len(dead),
+                        strength=units.strength[dead],
+                        intelligence=units.intelligence[dead],
+                        charisma=units.charisma[dead],
+                        defense=units.defense[dead],
+                        health=50)
+    for unit in dead:
+        units.remove(unit)
+    army.raised += len(dead)
+
+
+MASS_ABILITIES = {
+    cersei_ability: wildfire,
+    night_king_ability: raise_dead,
+    dragon_ability: dragonfire,
+}
+
+
+class MassBattle:
+    def __init__(self, first, second, seed=None, defend_chance=0.1, ability_chance=0.2,
+                 splash=10, raise_limit=25):
+        self.armies = (first, second)
+        self.rng = np.random.default_rng(seed)
+        self.defend_chance = defend_chance
+        self.ability_chance = ability_chance
+        self.splash = splash
+        self.raise_limit = raise_limit
+        self.round = 0
+
+    def pick(self, units, count):
+        if len(units) <= count:
+            return units
+        return self.rng.choice(units, count, replace=False)
+
+    def attacks(self, army, enemy, defending, enemy_defending):
+        # Every unit that isn't defending swings at a random living enemy
+        attackers = army.units.alive()
+        targets = enemy.units.alive()
+        attackers = attackers[~defending[attackers]]
+        if not len(attackers) or not len(targets):
+            return targets[:0], np.zeros(0, dtype=np.int32)
+        targets = targets[self.rng.integers(len(targets), size=len(attackers))]
+        strength = army.units.strength[attackers].astype(np.int32)
+        # Same rule as CombatEngine.enemy_turn: a defending target halves the blow
+        strength = np.where(enemy_defending[targets], strength // 2, strength)
+        return targets, np.maximum(1, strength - enemy.units.defense[targets])
+
+    def play_round(self):
+        self.round += 1
+        first, second = self.armies
+        before = {army.name: army.units.alive() for army in self.armies}
+        defending = {army.name: self.defenders(army) for army in self.armies}
+
+        # Both sides strike from the state at the start of the round
+        hits = (self.attacks(first, second, defending[first.name], defending[second.name]),
+                self.attacks(second, first, defending[second.name], defending[first.name]))
+        second.units.damage(*hits[0])
+        first.units.damage(*hits[1])
+
+        fallen = {army.name: before[army.name][army.units.health[before[army.name]] <= 0]
+                  for army in self.armies}
+        for army, enemy in ((first, second), (second, first)):
+            for index, boss in army.leaders.items():
+                ability = MASS_ABILITIES.get(boss.special_ability)
+                if (ability is not None and army.units.health[index] > 0
+                        and self.rng.random() < self.ability_chance):
+                    ability(self, army, enemy, index, fallen)
+
+    def defenders(self, army):
+        units = army.units
+        defending = self.rng.random(units.end) < self.defend_chance
+        for index in army.leaders:
+            defending[index] = False
+        return defending
+
+    def resolve(self, max_rounds=500):
+        first, second = self.armies
+        while len(first) and len(second) and self.round < max_rounds:
+            self.play_round()
+        return self.result()
+
+    def result(self):
+        for army in self.armies:
+            for index, boss in army.leaders.items():
+                boss.health = int(army.units.health[index])
+        survivors = {army.name: len(army) for army in self.armies}
+        first, second = self.armies
+        if survivors[first.name] and not survivors[second.name]:
+            winner = first
+        elif survivors[second.name] and not survivors[first.name]:
+            winner = second
+        else:
+            winner = None
+        casualties = {army.name: army.mustered + army.raised - survivors[army.name]
+                      for army in self.armies}
+        raised = {army.name: army.raised for army in self.armies}
+        lines = [f"{army.name}: {survivors[army.name]} standing, {casualties[army.name]} fallen"
+                 + (f", {army.raised} raised from the dead" if army.raised else "")
+                 for army in self.armies]
+        outcome = f"{winner.name} wins" if winner else "Neither side holds the field"
+        summary = f"{outcome} after {self.round} rounds. " + "; ".join(lines) + "."
+        return BattleResult(winner, self.round, survivors, casualties, raised, summary)
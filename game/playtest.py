@@ -0,0 +1,228 @@
+import argparse
+import contextlib
+import json
+import os
+import random
+import time
+from multiprocessing import Pool
+import numpy as np
+from game.combat import cautious_policy
+from game.quests import ReachPosition
+from game.session import ENEMIES, GameSession
+from models.character import CHARACTER_CLASSES
+
+DIRECTIONS = {'north': (0, -1), 'south': (0, 1), 'west': (-1, 0), 'east': (1, 0)}
+
+
+class ScriptedBot:
+    # Plays a headless session the way a cautious player would: heal when
+    # hurt, shop and rest in towns, take quests from guards, pick the odd
+    # fight and otherwise walk towards quest targets or unvisited places.
+    def __init__(self, session, rng):
+        self.session = session
+        self.player = session.player
+        self.rng = rng
+        self.visited = set()
+        self.done_here = set()
+        self.fights = 0
+        self.wins = 0
+        self.bosses_defeated = 0
+        session.subscribe('combat_ended', self.on_combat_ended)
+
+    def on_combat_ended(self, engine):
+        self.fights += 1
+        if engine.winner is self.player:
+            self.wins += 1
+            if engine.enemy in self.session.game_board.bosses:
+                self.bosses_defeated += 1
+
+    def act(self):
+        session, player = self.session, self.player
+        if session.combat is not None:  # Ambushed on the last move
+            session.resolve_combat(cautious_policy)
+            return
+        if player.health < 40 and 'Health Potion' in player.inventory:
+            session.use_item('Health Potion')
+            return
+
+        position = player.position
+        npc_types = {npc.type for npc in session.game_board.npcs_at(*position)}
+        if 'Innkeeper' in npc_types and player.health < 70 and player.gold >= 20:
+            session.rest()
+            return
+        if ('Merchant' in npc_types and 'buy' not in self.done_here and player.gold >= 150
+                and player.inventory.count('Health Potion') < 3):
+            self.done_here.add('buy')
+            session.buy('Health Potion')
+            return
+        if 'Guard' in npc_types and 'guard' not in self.done_here:
+            self.done_here.add('guard')
+            if session.quests.active < 3:
+                session.request_quest()
+            else:
+                session.ask_information()
+            return
+
+        boss = session.current_location().boss
+        if (boss is not None and boss.is_alive() and 'boss' not in self.done_here
+                and self.can_beat(boss)):
+            self.done_here.add('boss')
+            session.start_combat()
+            session.resolve_combat(cautious_policy)
+            return
+        if player.health > 60 and self.rng.random() < 0.05:
+            session.start_combat(self.rng.choice(ENEMIES))
+            session.resolve_combat(cautious_policy)
+            return
+
+        self.visited.add(position)
+        self.step_towards(self.target())
+
+    def can_beat(self, enemy):
+        # Trade blows on paper, ignoring abilities and items
+        player = self.player
+        turns_to_win = enemy.health / max(1, player.strength - enemy.defense)
+        turns_to_lose = player.health / max(1, enemy.strength - player.defense)
+        return turns_to_win < turns_to_lose
+
+    def target(self):
+        position = self.player.position
+        goals = []
+        for quest in self.session.quests:
+            if quest.completed or not self.session.quests.is_unlocked(quest):
+                continue
+            # Only head for a quest's place once everything else it needs is done
+            places = [trigger.position for trigger in quest.triggers if isinstance(trigger, ReachPosition)]
+            others = [trigger for trigger in quest.triggers if not isinstance(trigger, ReachPosition)]
+            if all(trigger.is_met(self.player) for trigger in others):
+                goals.extend(places)
+        if not goals:
+            goals = [tile for tile in self.session.game_board.named_positions() if tile not in self.visited]
+        if not goals:
+            self.visited.clear()
+            return None
+        return min(goals, key=lambda goal: abs(goal[0] - position[0]) + abs(goal[1] - position[1]))
+
+    def step_towards(self, goal):
+        x, y = self.player.position
+        if goal is None or goal == (x, y):
+            direction = self.rng.choice(list(DIRECTIONS))
+        elif goal[0] != x and (goal[1] == y or self.rng.random() < 0.5):
+            direction = 'east' if goal[0] > x else 'west'
+        else:
+            direction = 'south' if goal[1] > y else 'north'
+        self.done_here.clear()
+        self.session.move(direction)
+
+
+def play(class_name, seed, steps=500, board_size=10, sample_every=25):
+    player = CHARACTER_CLASSES[class_name]("Bot", None)
+    session = GameSession(player, seed=seed, board_size=board_size)
+    session.set_ambush_policy('Cautious')
+    bot = ScriptedBot(session, random.Random(f"{seed}:bot"))
+
+    step = 0
+    quest_steps = {}
+    session.quests.subscribe('quest_completed', lambda quest: quest_steps.setdefault(quest.name, step))
+    gold = []
+    while step < steps and player.is_alive():
+        if step % sample_every == 0:
+            gold.append(player.gold)
+        bot.act()
+        step += 1
+    return {
+        'class': class_name,
+        'seed': seed,
+        'steps': step,
+        'died': not player.is_alive(),
+        'gold': gold,
+        'final_gold': player.gold,
+        'quest_steps': quest_steps,
+        'fights': bot.fights,
+        'wins': bot.wins,
+        'bosses_defeated': bot.bosses_defeated,
+    }
+
+
+def play_batch(batch):
+    # Item effects print to stdout; thousands of runs would drown the report
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        return [play(*job) for job in batch]
+
+
+def run(classes, runs, seed=0, workers=None, steps=500, board_size=10, sample_every=25):
+    jobs = [(classes[i % len(classes)], seed + i, steps, board_size, sample_every) for i in range(runs)]
+    workers = workers or os.cpu_count() or 1
+    # A few batches per worker keeps every core busy without per-run IPC
+    size = max(1, len(jobs) // (workers * 4))
+    batches = [jobs[i:i + size] for i in range(0, len(jobs), size)]
+    if workers == 1:
+        return [result for batch in batches for result in play_batch(batch)]
+    with Pool(workers) as pool:
+        return [result for results in pool.imap_unordered(play_batch, batches) for result in results]
+
+
+def aggregate(results, sample_every=25):
+    report = {'runs': len(results), 'classes': {}, 'quests': {}}
+    for class_name in sorted({result['class'] for result in results}):
+        runs = [result for result in results if result['class'] == class_name]
+        # Runs that ended early keep their last gold value for the rest of the curve
+        length = max(len(result['gold']) for result in runs)
+        curves = np.array([result['gold'] + [result['final_gold']] * (length - len(result['gold']))
+                           for result in runs])
+        report['classes'][class_name] = {
+            'runs': len(runs),
+            'death_rate': float(np.mean([result['died'] for result in runs])),
+            'mean_final_gold': float(np.mean([result['final_gold'] for result in runs])),
+            'fight_win_rate': (sum(result['wins'] for result in runs)
+                               / max(1, sum(result['fights'] for result in runs))),
+            'bosses_defeated': sum(result['bosses_defeated'] for result in runs),
+            'gold_curve': {step * sample_every: float(value) for step, value in enumerate(curves.mean(axis=0))},
+        }
+    names = sorted({name for result in results for name in result['quest_steps']})
+    for name in names:
+        completed = [result['quest_steps'][name] for result in results if name in result['quest_steps']]
+        report['quests'][name] = {
+            'completion_rate': len(completed) / len(results),
+            'median_step': float(np.median(completed)),
+            'p90_step': float(np.percentile(completed, 90)),
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run scripted-bot playthroughs across all cores")
+    parser.add_argument('--runs', type=int, default=1000)
+    parser.add_argument('--steps', type=int, default=500, help="actions per playthrough")
+    parser.add_argument('--classes', nargs='+', choices=CHARACTER_CLASSES, default=list(CHARACTER_CLASSES))
+    parser.add_argument('--board-size', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0, help="seed of the first run; run i uses seed + i")
+    parser.add_argument('--workers', type=int, help="processes to use (defaults to every core)")
+    parser.add_argument('--sample-every', type=int, default=25, help="steps between gold samples")
+    parser.add_argument('--json', help="write the aggregated report to this file")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    results = run(args.classes, args.runs, args.seed, args.workers, args.steps,
+                  args.board_size, args.sample_every)
+    elapsed = time.perf_counter() - started
+    report = aggregate(results, args.sample_every)
+    report['seconds'] = elapsed
+
+    for class_name, stats in report['classes'].items():
+        curve = list(stats['gold_curve'].values())
+        print(f"{class_name}: {stats['runs']} runs, death rate {stats['death_rate']:.1%}, "
+              f"fights won {stats['fight_win_rate']:.1%}, bosses defeated {stats['bosses_defeated']}, "
+              f"gold {curve[0]:.0f} -> {curve[len(curve) // 2]:.0f} -> {stats['mean_final_gold']:.0f}")
+    for name, stats in report['quests'].items():
+        print(f"{name}: completed in {stats['completion_rate']:.1%} of runs, "
+              f"median step {stats['median_step']:.0f}, p90 {stats['p90_step']:.0f}")
+    print(f"Played {len(results)} runs in {elapsed:.2f}s ({len(results) / elapsed:,.1f} runs/s)")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,22 @@
+from concurrent.futures import ThreadPoolExecutor
+from game.rng import RandomStreams
+from game.session import GameSession, build_board
+
+
+class WorldPreloader:
+    # Generates the board on a worker thread while the player is still
+    # filling in the character form. The board never touches Qt, so it is
+    # safe to build off the GUI thread; session() waits only if the player
+    # was quicker than the generator.
+    def __init__(self, seed=None, board='dense', board_size=10):
+        self.rng = RandomStreams(seed)
+        self.board_kind = board
+        self.board_size = board_size
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="world")
+        self.future = executor.submit(build_board, self.rng, board, board_size)
+        executor.shutdown(wait=False)
+
+    def session(self, player, journal=None):
+        return GameSession(player, seed=self.rng.seed, board=self.board_kind,
+                           board_size=self.board_size, journal=journal,
+                           rng=self.rng, game_board=self.future.result())
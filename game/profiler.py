@@ -0,0 +1,159 @@
+import json
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+# Each power of two of nanoseconds is split into 2 ** SUB_BITS buckets, so a
+# reported percentile is within 25% of the true value
+SUB_BITS = 2
+SUB_BUCKETS = 1 << SUB_BITS
+BUCKETS = 64 * SUB_BUCKETS
+
+
+def bucket_index(ns):
+    bits = ns.bit_length()
+    if bits <= SUB_BITS:
+        return ns
+    return ((bits - SUB_BITS) << SUB_BITS) + (ns >> (bits - SUB_BITS - 1)) - SUB_BUCKETS
+
+
+def bucket_floor(index):
+    if index < SUB_BUCKETS:
+        return index
+    exponent, mantissa = index >> SUB_BITS, index & (SUB_BUCKETS - 1)
+    return (SUB_BUCKETS + mantissa) << (exponent - 1)
+
+
+class Histogram:
+    __slots__ = ('counts', 'count', 'total', 'max')
+
+    def __init__(self):
+        self.counts = [0] * BUCKETS
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, ns):
+        self.counts[bucket_index(ns)] += 1
+        self.count += 1
+        self.total += ns
+        if ns > self.max:
+            self.max = ns
+
+    def percentile(self, fraction):
+        if not self.count:
+            return 0
+        wanted = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= wanted:
+                return min(bucket_floor(index + 1), self.max)
+        return self.max
+
+    def mean(self):
+        return self.total / self.count if self.count else 0
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'total_ns': self.total,
+            'mean_ns': self.mean(),
+            'p50_ns': self.percentile(0.5),
+            'p90_ns': self.percentile(0.9),
+            'p99_ns': self.percentile(0.99),
+            'max_ns': self.max,
+            # Only occupied buckets, as (lower bound in ns, count)
+            'buckets': [(bucket_floor(index), count) for index, count in enumerate(self.counts) if count],
+        }
+
+
+class Profiler:
+    # Times named sections into histograms. A disabled profiler hands every
+    # function back unwrapped, so leaving the hooks in costs nothing at all.
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.histograms = {}
+        # Time spent waiting on the player (modal dialogs) inside timed sections
+        self.waiting = 0
+
+    def histogram(self, name):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        return histogram
+
+    def wrap(self, name, func):
+        if not self.enabled:
+            return func
+        record = self.histogram(name).record
+        clock = time.perf_counter_ns
+
+        @wraps(func)
+        def timed(*args, **kwargs):
+            waiting = self.waiting
+            started = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(clock() - started - (self.waiting - waiting))
+        return timed
+
+    def wrap_wait(self, func):
+        # For callbacks that block on the player; their time is left out of
+        # every section they run inside
+        if not self.enabled:
+            return func
+        clock = time.perf_counter_ns
+
+        @wraps(func)
+        def waited(*args, **kwargs):
+            started = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.waiting += clock() - started
+        return waited
+
+    @contextmanager
+    def section(self, name):
+        if not self.enabled:
+            yield
+            return
+        waiting = self.waiting
+        started = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.histogram(name).record(time.perf_counter_ns() - started - (self.waiting - waiting))
+
+    def instrument(self, obj, names, prefix=''):
+        # Shadows methods on this one instance; the class is left alone
+        if self.enabled:
+            for name in names:
+                setattr(obj, name, self.wrap(prefix + name, getattr(obj, name)))
+
+    def reset(self):
+        self.histograms.clear()
+
+    def report(self):
+        return {name: histogram.to_dict() for name, histogram in sorted(self.histograms.items())}
+
+    def dump(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.report(), f, indent=2)
+
+    def summary(self):
+        # (name, count, p50, p99, max) in milliseconds, slowest p99 first
+        rows = [(name, histogram.count, histogram.percentile(0.5) / 1e6,
+                 histogram.percentile(0.99) / 1e6, histogram.max / 1e6)
+                for name, histogram in self.histograms.items() if histogram.count]
+        rows.sort(key=lambda row: row[3], reverse=True)
+        return rows
+
+
+def instrument_session(profiler, session):
+    # Every player action, plus the rule work a move sets off
+    profiler.instrument(session, session.actions, 'action.')
+    profiler.instrument(session, ['check_for_events'], 'events.')
+    profiler.instrument(session.quests, ['evaluate'], 'quests.')
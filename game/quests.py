@@ -0,0 +1,129 @@
+import random
+from game.items import get_item
+from models.quest import Quest
+
+
+class ReachPosition:
+    def __init__(self, position):
+        self.position = tuple(position)
+
+    def index_key(self):
+        return ('position', self.position)
+
+    def is_met(self, player):
+        return player.position == self.position
+
+
+class HoldItem:
+    def __init__(self, item_name):
+        self.item_name = item_name
+
+    def index_key(self):
+        return ('item', self.item_name)
+
+    def is_met(self, player):
+        return self.item_name in player.inventory
+
+
+class StatThreshold:
+    def __init__(self, stat, value):
+        self.stat = stat
+        self.value = value
+
+    def index_key(self):
+        return ('stat', self.stat)
+
+    def is_met(self, player):
+        return getattr(player, self.stat) > self.value
+
+
+class GoldReward:
+    def __init__(self, amount):
+        self.amount = amount
+
+    def apply(self, player):
+        player.earn_gold(self.amount)
+
+
+class ItemReward:
+    def __init__(self, item_name):
+        self.item = get_item(item_name)
+
+    def apply(self, player):
+        player.inventory.add_item(self.item)
+
+
+class StatReward:
+    def __init__(self, stat, amount):
+        self.stat = stat
+        self.amount = amount
+
+    def apply(self, player):
+        setattr(player, self.stat, getattr(player, self.stat) + self.amount)
+
+
+TRIGGER_TYPES = {'position': ReachPosition, 'item': HoldItem, 'stat': StatThreshold}
+REWARD_TYPES = {'gold': GoldReward, 'item': ItemReward, 'stat': StatReward}
+
+# Quest content. A quest completes once all of its triggers hold and it only
+# becomes active after every quest in 'requires' has been completed.
+QUEST_DATA = [
+    {'name': "The King's Errand",
+     'description': "Deliver a message to the Night's Watch.",
+     'triggers': [('position', (5, 5))],
+     'rewards': [('gold', 100)]},
+    {'name': "Dragon's Egg",
+     'description': "Find a dragon egg in Dragonstone.",
+     'triggers': [('item', "Dragon Egg")],
+     'rewards': [('item', "Dragon Egg")]},
+    {'name': "Defend the Wall",
+     'description': "Help the Night's Watch defend against wildlings.",
+     'triggers': [('position', (0, 9)), ('stat', 'strength', 12)],
+     'rewards': [('stat', 'strength', 2)]},
+    {'name': "Patrol the Walls",
+     'description': "Help the city guard patrol the walls.",
+     'triggers': [('position', (3, 3))],
+     'rewards': [('gold', 75)]},
+    {'name': "Deliver a Message",
+     'description': "Deliver a confidential message to the Maester.",
+     'triggers': [('position', (7, 7))],
+     'rewards': [('item', "Rare Book")]},
+    {'name': "Investigate Rumors",
+     'description': "Investigate rumors of bandits in the nearby forest.",
+     'triggers': [('item', "Bandit's Emblem")],
+     'rewards': [('stat', 'strength', 3)]},
+]
+
+STARTING_QUESTS = ["The King's Errand", "Dragon's Egg", "Defend the Wall"]
+GUARD_QUESTS = ["Patrol the Walls", "Deliver a Message", "Investigate Rumors"]
+
+
+def compile_quests(quest_data):
+    # Triggers and rewards are immutable, so every Quest instance shares them
+    catalog = {}
+    for entry in quest_data:
+        triggers = tuple(TRIGGER_TYPES[kind](*args) for kind, *args in entry['triggers'])
+        rewards = tuple(REWARD_TYPES[kind](*args) for kind, *args in entry['rewards'])
+        catalog[entry['name']] = (entry['description'], rewards, triggers,
+                                  tuple(entry.get('requires', ())))
+    for name, (_, _, _, requires) in catalog.items():
+        for prerequisite in requires:
+            if prerequisite not in catalog:
+                raise ValueError(f"Quest {name!r} requires unknown quest {prerequisite!r}")
+    return catalog
+
+
+QUESTS = compile_quests(QUEST_DATA)
+
+
+def create_quest(name):
+    description, rewards, triggers, requires = QUESTS[name]
+    return Quest(name, description, rewards, triggers, requires)
+
+
+def starting_quests():
+    return [create_quest(name) for name in STARTING_QUESTS]
+
+
+def guard_quest(rng=random):
+    return create_quest(rng.choice(GUARD_QUESTS))
@@ -0,0 +1,30 @@
+import argparse
+import json
+import time
+from game.journal import Journal
+from game.session import GameSession
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded game journal without the GUI")
+    parser.add_argument('journal')
+    parser.add_argument('--expect', help="JSON file with the expected final state")
+    args = parser.parse_args()
+
+    journal = Journal.load(args.journal)
+    started = time.perf_counter()
+    session = GameSession.replay(journal)
+    elapsed = time.perf_counter() - started
+    state = session.state()
+    print(json.dumps(state, indent=2))
+    print(f"Replayed {len(journal.entries)} actions in {elapsed * 1000:.1f} ms")
+
+    if args.expect:
+        with open(args.expect) as f:
+            expected = json.load(f)
+        if json.loads(json.dumps(state)) != expected:
+            raise SystemExit("Replay diverged from the expected state")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,15 @@
+import random
+
+
+class RandomStreams:
+    # Independent, reproducible random.Random per subsystem so that e.g. an
+    # extra combat roll never shifts which random event fires next
+    def __init__(self, seed=None):
+        self.seed = seed if seed is not None else random.randrange(1 << 63)
+        self.streams = {}
+
+    def stream(self, name):
+        rng = self.streams.get(name)
+        if rng is None:
+            rng = self.streams[name] = random.Random(f"{self.seed}:{name}")
+        return rng
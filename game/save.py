@@ -0,0 +1,305 @@
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from game.items import item_by_id
+from game.quests import create_quest
+from game.session import GameSession
+
+SAVE_MAGIC = b'GOTS'
+SAVE_VERSION = 3
+
+FILE_HEADER = struct.Struct('<4sH')
+SECTION_HEADER = struct.Struct('<BI')
+
+# Section tags. A save file is a sequence of sections; autosave appends newer
+# copies of the sections that changed and the last copy of each tag wins.
+HEADER, PLAYER, INVENTORY, QUESTS, BOARD, RANDOM, EVENTS = range(1, 8)
+
+BOARD_KINDS = ['dense', 'sparse', 'streaming']
+
+
+class Writer:
+    def __init__(self):
+        self.data = bytearray()
+
+    def pack(self, fmt, *values):
+        self.data += struct.pack(fmt, *values)
+
+    def string(self, text):
+        encoded = (text or '').encode('utf-8')
+        self.pack('<H', len(encoded))
+        self.data += encoded
+
+
+class Reader:
+    def __init__(self, data):
+        self.data = data
+        self.offset = 0
+
+    def unpack(self, fmt):
+        values = struct.unpack_from(fmt, self.data, self.offset)
+        self.offset += struct.calcsize(fmt)
+        return values
+
+    def string(self):
+        length, = self.unpack('<H')
+        text = bytes(self.data[self.offset:self.offset + length]).decode('utf-8')
+        self.offset += length
+        return text
+
+
+def encode_header(session):
+    header = session.header()
+    writer = Writer()
+    writer.pack('<QBI', header['seed'], BOARD_KINDS.index(header['board']), header['board_size'])
+    writer.string(header['name'])
+    writer.string(header['house'])
+    writer.string(header['class'])
+    return writer.data
+
+
+def encode_player(session):
+    player = session.player
+    writer = Writer()
+    writer.pack('<iihihhhh', *player.position, player.health, player.gold,
+                player.strength, player.intelligence, player.charisma, player.defense)
+    return writer.data
+
+
+def encode_inventory(session):
+    # Items are stored by catalog id, never by their effect closures
+    writer = Writer()
+    inventory = session.player.inventory
+    writer.pack('<H', len(inventory.stacks))
+    for item, count in inventory:
+        writer.pack('<HH', item.id, count)
+    return writer.data
+
+
+def encode_quests(session):
+    writer = Writer()
+    writer.pack('<H', len(session.quests))
+    for quest in session.quests:
+        writer.string(quest.name)
+        writer.pack('<?', quest.completed)
+    return writer.data
+
+
+def encode_board(session):
+    board = session.game_board
+    writer = Writer()
+    writer.pack('<H', len(board.bosses))
+    for boss in board.bosses:
+        writer.pack('<h', boss.health)
+    # Streaming worlds regenerate from their seed; fixed boards store their named tiles
+    tiles = {} if session.board_kind == 'streaming' else board.named_positions()
+    writer.pack('<I', len(tiles))
+    for (x, y), location in tiles.items():
+        writer.pack('<IIB', x, y, board.locations.index(location))
+    return writer.data
+
+
+def encode_random(session):
+    writer = Writer()
+    writer.pack('<H', len(session.rng.streams))
+    for name, rng in session.rng.streams.items():
+        version, state, gauss = rng.getstate()
+        writer.string(name)
+        writer.pack('<B', version)
+        writer.pack(f'<H{len(state)}I', len(state), *state)
+        writer.pack('<?d', gauss is not None, gauss or 0.0)
+    return writer.data
+
+
+def encode_events(session):
+    # Event cooldowns, counted in steps since the session started
+    events = session.events
+    writer = Writer()
+    writer.pack('<IH', events.checks, len(events.ready_at))
+    for name, ready_at in events.ready_at.items():
+        writer.string(name)
+        writer.pack('<I', ready_at)
+    return writer.data
+
+
+ENCODERS = {
+    HEADER: encode_header,
+    PLAYER: encode_player,
+    INVENTORY: encode_inventory,
+    QUESTS: encode_quests,
+    BOARD: encode_board,
+    RANDOM: encode_random,
+    EVENTS: encode_events,
+}
+
+
+def encode_sections(session, tags):
+    data = bytearray()
+    for tag in tags:
+        payload = ENCODERS[tag](session)
+        data += SECTION_HEADER.pack(tag, len(payload))
+        data += payload
+    return bytes(data)
+
+
+def encode_game(session):
+    return FILE_HEADER.pack(SAVE_MAGIC, SAVE_VERSION) + encode_sections(session, sorted(ENCODERS))
+
+
+def save_game(session, path):
+    write_atomic(path, encode_game(session))
+
+
+def write_atomic(path, data):
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+    os.replace(temp_path, path)
+
+
+def read_sections(data):
+    magic, version = FILE_HEADER.unpack_from(data, 0)
+    if magic != SAVE_MAGIC:
+        raise ValueError("Not a Game of Thrones RPG save file")
+    if version != SAVE_VERSION:
+        raise ValueError(f"Unsupported save version: {version}")
+    sections = {}
+    offset = FILE_HEADER.size
+    while offset + SECTION_HEADER.size <= len(data):
+        tag, length = SECTION_HEADER.unpack_from(data, offset)
+        offset += SECTION_HEADER.size
+        if offset + length > len(data):
+            break  # Torn write at the end of the file; keep the previous copy
+        sections[tag] = memoryview(data)[offset:offset + length]
+        offset += length
+    return sections
+
+
+def load_game(path, journal=None):
+    with open(path, 'rb') as f:
+        sections = read_sections(f.read())
+
+    reader = Reader(sections[HEADER])
+    seed, board_kind, board_size = reader.unpack('<QBI')
+    header = {
+        'seed': seed,
+        'board': BOARD_KINDS[board_kind],
+        'board_size': board_size,
+        'name': reader.string(),
+        'house': reader.string() or None,
+        'class': reader.string(),
+    }
+    session = GameSession.from_header(header, journal=journal)
+
+    # Quests first so restoring the player doesn't re-award finished quests
+    reader = Reader(sections[QUESTS])
+    quests = []
+    for _ in range(reader.unpack('<H')[0]):
+        quest = create_quest(reader.string())
+        quest.completed, = reader.unpack('<?')
+        quests.append(quest)
+    session.quests.reset(quests)
+
+    reader = Reader(sections[BOARD])
+    for boss in session.game_board.bosses[:reader.unpack('<H')[0]]:
+        boss.health, = reader.unpack('<h')
+    tiles = {}
+    for _ in range(reader.unpack('<I')[0]):
+        x, y, index = reader.unpack('<IIB')
+        tiles[(x, y)] = session.game_board.locations[index]
+    if tiles:
+        session.game_board.restore_tiles(tiles)
+
+    reader = Reader(sections[INVENTORY])
+    inventory = session.player.inventory
+    for _ in range(reader.unpack('<H')[0]):
+        item_id, count = reader.unpack('<HH')
+        inventory.add_item(item_by_id(item_id), count)
+
+    reader = Reader(sections[PLAYER])
+    x, y, health, gold, strength, intelligence, charisma, defense = reader.unpack('<iihihhhh')
+    player = session.player
+    player.position = (x, y)
+    player.health = health
+    player.gold = gold
+    player.strength = strength
+    player.intelligence = intelligence
+    player.charisma = charisma
+    player.defense = defense
+
+    reader = Reader(sections[RANDOM])
+    for _ in range(reader.unpack('<H')[0]):
+        name = reader.string()
+        version, = reader.unpack('<B')
+        length, = reader.unpack('<H')
+        state = reader.unpack(f'<{length}I')
+        has_gauss, gauss = reader.unpack('<?d')
+        session.rng.stream(name).setstate((version, state, gauss if has_gauss else None))
+
+    if EVENTS in sections:  # Older saves have no cooldowns to restore
+        reader = Reader(sections[EVENTS])
+        checks, count = reader.unpack('<IH')
+        session.events.checks = checks
+        for _ in range(count):
+            name = reader.string()
+            session.events.ready_at[name], = reader.unpack('<I')
+    return session
+
+
+class Autosaver:
+    # Tracks which sections changed and appends only those, encoded on the
+    # caller's thread and written by a single background worker
+    def __init__(self, session, path, compact_ratio=4):
+        self.session = session
+        self.path = path
+        self.compact_ratio = compact_ratio
+        self.dirty = set()
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='autosave')
+        self.base_size = 0
+        self.file_size = 0
+        self.pending = None
+
+        player = session.player
+        for event in ('position_changed', 'stats_changed', 'health_changed', 'gold_changed'):
+            player.subscribe(event, self.mark(PLAYER))
+        player.inventory.subscribe('item_added', self.mark(INVENTORY))
+        player.inventory.subscribe('item_removed', self.mark(INVENTORY))
+        session.quests.subscribe('quest_added', self.mark(QUESTS))
+        session.quests.subscribe('quest_completed', self.mark(QUESTS))
+        session.subscribe('combat_ended', self.mark(BOARD))
+        session.subscribe('battle_ended', self.mark(BOARD))
+
+        self.save_full()
+
+    def mark(self, tag):
+        def callback(*args):
+            self.dirty.add(tag)
+        return callback
+
+    def save_full(self):
+        data = encode_game(self.session)
+        self.dirty.clear()
+        self.base_size = self.file_size = len(data)
+        self.pending = self.executor.submit(write_atomic, self.path, data)
+
+    def flush(self):
+        if not self.dirty:
+            return False
+        # Any state change may have consumed random numbers and moved cooldowns on
+        self.dirty.update((RANDOM, EVENTS))
+        if self.file_size > self.base_size * self.compact_ratio:
+            self.save_full()
+            return True
+        data = encode_sections(self.session, sorted(self.dirty))
+        self.dirty.clear()
+        self.file_size += len(data)
+        self.pending = self.executor.submit(self.append, data)
+        return True
+
+    def append(self, data):
+        with open(self.path, 'ab') as f:
+            f.write(data)
+
+    def close(self):
+        self.flush()
+        self.executor.shutdown(wait=True)
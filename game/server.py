@@ -0,0 +1,256 @@
+import argparse
+import asyncio
+import gc
+import json
+import sys
+import types
+from game.events import EVENTS
+from game.items import ITEMS, MERCHANT_ITEMS
+from game.quests import QUESTS
+from game.save import BOARD_KINDS
+from game.session import GameSession
+from models.character import CHARACTER_CLASSES
+from models.house import House
+
+# Stop reading from a client once this much of its output is still unsent
+HIGH_WATER = 1 << 20
+# Clients pick their board size; a dense board holds size * size tiles, so
+# anything bigger than MAX_DENSE_SIZE is stored sparse
+MAX_DENSE_SIZE = 100
+MAX_BOARD_SIZE = 1_000_000
+# Objects every session points at but none of them owns
+SHARED_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType,
+                types.MethodDescriptorType, types.CodeType)
+
+
+def deep_size(root, skip=()):
+    # Bytes reachable from root, counting each object once and leaving out
+    # code and anything in skip (catalog data shared by every session)
+    seen = {id(value) for value in skip}
+    seen.update((id(None), id(True), id(False)))
+    stack = [root]
+    total = 0
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, SHARED_TYPES):
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        stack.extend(gc.get_referents(obj))
+    return total
+
+
+def shared_objects():
+    # Compiled quest entries are tuples whose parts every Quest instance shares
+    quest_parts = [part for entry in QUESTS.values() for part in entry]
+    return [ITEMS, MERCHANT_ITEMS, *ITEMS.values(), EVENTS, QUESTS, *QUESTS.values(), *quest_parts]
+
+
+def encode_result(value):
+    # Action results as plain JSON: combat records become their messages,
+    # fights and battles their summary, quests their name
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, list):
+        return [getattr(record, 'message', record) for record in value]
+    summary = getattr(value, 'summary', None)
+    if summary is not None:
+        return summary() if callable(summary) else summary
+    return getattr(value, 'name', None)
+
+
+class HostedSession:
+    __slots__ = ('session', 'messages', 'owner')
+
+    def __init__(self, session, owner):
+        self.session = session
+        self.owner = owner
+        # Messages since the last response; they ride along with the next one
+        self.messages = []
+        session.subscribe('message', self.messages.append)
+
+    def take_messages(self):
+        messages = self.messages[:]
+        self.messages.clear()  # Same list, the session's listener appends to it
+        return messages
+
+    def memory(self, skip=()):
+        # The owner is the client's connection, which the session doesn't own
+        return deep_size(self, [*skip, self.owner])
+
+    def combat(self):
+        engine = self.session.combat
+        if engine is None:
+            return None
+        return {'enemy': engine.enemy.name, 'enemy_health': engine.enemy.health, 'turn': engine.turn}
+
+
+class GameServer:
+    # Hosts many independent GameSessions in one process. Requests are
+    # newline-delimited JSON; everything that arrives during one turn of the
+    # event loop is handled in a single batch and each client gets its
+    # replies in one write.
+    def __init__(self, max_sessions=100_000):
+        self.max_sessions = max_sessions
+        self.sessions = {}
+        self.owned = {}  # client writer -> ids of the sessions it started
+        self.next_id = 1
+        self.pending = []
+        self.scheduled = False
+        self.ticks = 0
+        self.requests = 0
+        self.ops = {
+            'new': self.op_new,
+            'act': self.op_act,
+            'state': self.op_state,
+            'close': self.op_close,
+            'stats': self.op_stats,
+        }
+
+    async def handle_client(self, reader, writer):
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                self.pending.append((writer, line))
+                if not self.scheduled:
+                    self.scheduled = True
+                    loop.call_soon(self.tick)
+                if writer.transport.get_write_buffer_size() > HIGH_WATER:
+                    await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            # A client's games end with its connection
+            for session_id in self.owned.pop(writer, ()):
+                hosted = self.sessions.pop(session_id, None)
+                if hosted is not None:
+                    hosted.session.close()
+            writer.close()
+
+    def tick(self):
+        self.scheduled = False
+        batch, self.pending = self.pending, []
+        self.ticks += 1
+        self.requests += len(batch)
+        replies = {}
+        for writer, line in batch:
+            replies.setdefault(writer, []).append(self.handle(writer, line))
+        for writer, lines in replies.items():
+            if not writer.is_closing():
+                writer.write(b''.join(lines))
+
+    def handle(self, writer, line):
+        request = {}
+        try:
+            request = json.loads(line)
+            op = self.ops.get(request.get('op'))
+            if op is None:
+                raise ValueError(f"Unknown op: {request.get('op')}")
+            response = op(writer, request)
+            response['ok'] = True
+        except Exception as error:  # One bad request must not take the other sessions down
+            response = {'ok': False, 'error': f"{type(error).__name__}: {error}"}
+        if isinstance(request, dict) and 'id' in request:
+            response['id'] = request['id']
+        return (json.dumps(response, separators=(',', ':')) + '\n').encode()
+
+    def hosted(self, writer, request):
+        hosted = self.sessions.get(request.get('session'))
+        if hosted is None or hosted.owner is not writer:
+            raise KeyError(f"No such session: {request.get('session')}")
+        return hosted
+
+    def op_new(self, writer, request):
+        if len(self.sessions) >= self.max_sessions:
+            raise ValueError("Server is full")
+        house = request.get('house')
+        if house is not None:
+            house = House(house, f"{house} Sigil", f"{house} Words")
+        board = request.get('board', 'dense')
+        if board not in BOARD_KINDS:
+            raise ValueError(f"Unknown board: {board}")
+        board_size = request.get('board_size', 10)
+        if type(board_size) is not int or not 1 <= board_size <= MAX_BOARD_SIZE:
+            raise ValueError(f"board_size must be between 1 and {MAX_BOARD_SIZE}")
+        if board == 'dense' and board_size > MAX_DENSE_SIZE:
+            board = 'sparse'
+        player = CHARACTER_CLASSES[request.get('class', 'Warrior')](request.get('name', 'Player'), house)
+        session = GameSession(player, seed=request.get('seed'), board=board, board_size=board_size)
+        if request.get('auto_ambush', True):
+            session.set_ambush_policy('Cautious')
+        session_id = self.next_id
+        self.next_id += 1
+        self.sessions[session_id] = HostedSession(session, writer)
+        self.owned.setdefault(writer, set()).add(session_id)
+        return {'session': session_id, 'seed': session.rng.seed, 'state': session.state()}
+
+    def op_act(self, writer, request):
+        hosted = self.hosted(writer, request)
+        result = hosted.session.apply(request['action'], *request.get('args', ()))
+        return {
+            'result': encode_result(result),
+            'messages': hosted.take_messages(),
+            'state': hosted.session.state(),
+            'combat': hosted.combat(),
+        }
+
+    def op_state(self, writer, request):
+        hosted = self.hosted(writer, request)
+        return {'state': hosted.session.state(), 'combat': hosted.combat(),
+                'messages': hosted.take_messages()}
+
+    def op_close(self, writer, request):
+        hosted = self.hosted(writer, request)
+        del self.sessions[request['session']]
+        self.owned[writer].discard(request['session'])
+        hosted.session.close()
+        return {'actions': len(hosted.session.journal.entries)}
+
+    def op_stats(self, writer, request):
+        skip = shared_objects()
+        if 'session' in request:
+            return {'bytes': self.hosted(writer, request).memory(skip)}
+        # Walking every session would stall the loop, so a sample stands in
+        sample = list(self.sessions.values())[:request.get('sample', 100)]
+        sizes = [hosted.memory(skip) for hosted in sample]
+        return {
+            'sessions': len(self.sessions),
+            'requests': self.requests,
+            'ticks': self.ticks,
+            'session_bytes': {
+                'sampled': len(sizes),
+                'mean': sum(sizes) / len(sizes) if sizes else 0,
+                'max': max(sizes, default=0),
+            },
+        }
+
+
+async def serve(server, host='127.0.0.1', port=8765, unix=None):
+    if unix:
+        listener = await asyncio.start_unix_server(server.handle_client, path=unix)
+    else:
+        listener = await asyncio.start_server(server.handle_client, host, port)
+    names = ', '.join(str(sock.getsockname()) for sock in listener.sockets)
+    print(f"Serving games on {names}")
+    async with listener:
+        await listener.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Host many headless games in one process")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', help="listen on this Unix socket path instead of TCP")
+    parser.add_argument('--max-sessions', type=int, default=100_000)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(GameServer(args.max_sessions), args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
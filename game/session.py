@@ -0,0 +1,330 @@
+from game.combat import POLICIES, CombatEngine
+from game.events import EventDirector
+from game.game_board import GameBoard
+from game.items import ITEMS, merchant_stock
+from game.journal import Journal
+from game.mass_battle import Army, MassBattle
+from game.quests import guard_quest, starting_quests
+from game.rng import RandomStreams
+from game.travel import Pathfinder
+from game.world import StreamingWorld
+from models.character import CHARACTER_CLASSES, Boss, Character
+from models.house import House
+from models.observable import Observable
+from models.quest import QuestLog
+
+ENEMIES = ['Bandit', 'Wild Animal', 'Rival House Soldier']
+
+GUARD_INFORMATION = [
+    "I heard rumors of a dragon sighting near Dragonstone.",
+    "The Lannisters are plotting something in King's Landing.",
+    "Winter is coming, and the Night's Watch needs more men.",
+    "There's unrest in the Iron Islands."
+]
+
+
+def build_board(rng, kind='dense', size=10):
+    # Needs nothing from the player, so it can run before the character exists
+    if kind == 'streaming':
+        return StreamingWorld(seed=rng.stream('board').randrange(1 << 32))
+    return GameBoard(size, sparse=kind == 'sparse', rng=rng.stream('board'))
+
+
+class GameSession(Observable):
+    # Player actions that are journaled and can be replayed by name
+    actions = ('move', 'buy', 'sell', 'rest', 'ask_information', 'request_quest',
+               'use_item', 'start_combat', 'combat_step', 'mass_battle', 'travel', 'set_ambush_policy')
+
+    def __init__(self, player, seed=None, board='dense', board_size=10, journal=None,
+                 rng=None, game_board=None):
+        super().__init__()
+        self.player = player
+        # A board built ahead of time (see WorldPreloader) comes with the streams it was built from
+        self.rng = rng if rng is not None else RandomStreams(seed)
+        self.board_kind = board
+        self.board_size = board_size
+        if game_board is None:
+            game_board = build_board(self.rng, board, board_size)
+        self.game_board = game_board
+        if board == 'streaming':
+            game_board.follow(player)
+        self.pathfinder = Pathfinder(self.game_board)
+        self.quests = QuestLog(starting_quests())
+        self.combat = None
+        self.ambushed = False  # Set by an ambush; travel stops on it
+        self.events = EventDirector()
+        # Combat policy used to settle ambushes on the spot; None hands them to the player
+        self.ambush_policy = None
+        self.journal = journal if journal is not None else Journal()
+        self.journal.start(self.header())
+        self.quests.watch(player)
+
+    def header(self):
+        return {
+            'seed': self.rng.seed,
+            'board': self.board_kind,
+            'board_size': self.board_size,
+            'name': self.player.name,
+            'house': getattr(self.player.house, 'name', self.player.house),
+            'class': type(self.player).__name__,
+        }
+
+    @classmethod
+    def from_header(cls, header, journal=None):
+        house = header['house']
+        if house is not None:
+            house = House(house, f"{house} Sigil", f"{house} Words")
+        player = CHARACTER_CLASSES[header['class']](header['name'], house)
+        return cls(player, seed=header['seed'], board=header['board'],
+                   board_size=header['board_size'], journal=journal)
+
+    @classmethod
+    def replay(cls, journal):
+        session = cls.from_header(journal.header)
+        for action, *args in journal.entries:
+            session.apply(action, *args)
+        return session
+
+    def apply(self, action, *args):
+        if action not in self.actions:
+            raise ValueError(f"Unknown action: {action}")
+        return getattr(self, action)(*args)
+
+    def state(self):
+        # Plain snapshot used to check that a replay reached the same place
+        return {
+            'position': self.player.position,
+            'health': self.player.health,
+            'gold': self.player.gold,
+            'stats': (self.player.strength, self.player.intelligence,
+                      self.player.charisma, self.player.defense),
+            'inventory': [(item.name, count) for item, count in self.player.inventory],
+            'quests': [(quest.name, quest.completed) for quest in self.quests],
+        }
+
+    def close(self):
+        # Releases the board's chunk cache and the journal file
+        if hasattr(self.game_board, 'close'):
+            self.game_board.close()
+        self.journal.close()
+
+    def message(self, text):
+        self.emit('message', text)
+
+    def current_location(self):
+        return self.game_board.get_location(*self.player.position)
+
+    def move(self, direction):
+        self.journal.record('move', direction)
+        self.step(direction)
+
+    def step(self, direction):
+        x, y = self.player.position
+        if direction == 'north' and y > 0:
+            self.player.position = (x, y - 1)
+        elif direction == 'south' and y < self.game_board.size - 1:
+            self.player.position = (x, y + 1)
+        elif direction == 'west' and x > 0:
+            self.player.position = (x - 1, y)
+        elif direction == 'east' and x < self.game_board.size - 1:
+            self.player.position = (x + 1, y)
+        self.check_for_events()
+
+    def travel(self, x, y):
+        # Walks the whole route as one action. Every tile still rolls its
+        # event, and the journey stops at the first ambush (however the fight
+        # was settled) or a death, so replays end the trip on the same tile.
+        size = self.game_board.size
+        if not (0 <= x < size and 0 <= y < size):
+            raise ValueError(f"Can't travel to ({x}, {y}), off the board")
+        self.journal.record('travel', x, y)
+        route = self.pathfinder.route(self.player.position, (x, y))
+        self.ambushed = False
+        self.emit('travel_started', route)
+        for direction in route:
+            self.step(direction)
+            if self.ambushed or not self.player.is_alive():
+                break
+        self.emit('travel_ended', self.player.position)
+        return self.player.position == (x, y)
+
+    def buy(self, item_name):
+        self.journal.record('buy', item_name)
+        chosen_item = ITEMS.get(item_name)
+        if chosen_item not in merchant_stock():
+            return False
+        if self.player.gold >= chosen_item.value:
+            self.player.gold -= chosen_item.value
+            self.player.inventory.add_item(chosen_item)
+            self.message(f"You bought {chosen_item.name} for {chosen_item.value} gold.")
+            return True
+        self.message("Not enough gold to buy this item.")
+        return False
+
+    def sell(self, item_name):
+        self.journal.record('sell', item_name)
+        chosen_item = self.find_item(item_name)
+        if chosen_item is None:
+            self.message("You have no items to sell.")
+            return False
+        self.player.gold += chosen_item.value // 2
+        self.player.inventory.remove_item(chosen_item)
+        self.message(f"You sold {chosen_item.name} for {chosen_item.value//2} gold.")
+        return True
+
+    def rest(self):
+        self.journal.record('rest')
+        if self.player.gold >= 20:
+            self.player.gold -= 20
+            health_recovered = min(100 - self.player.health, 50)
+            self.player.health += health_recovered
+            self.message(f"You rested for the night and recovered {health_recovered} health.")
+            return True
+        self.message("Not enough gold to rest for the night.")
+        return False
+
+    def ask_information(self):
+        self.journal.record('ask_information')
+        info = self.rng.stream('npc').choice(GUARD_INFORMATION)
+        self.message(f"Guard: '{info}'")
+
+    def request_quest(self):
+        self.journal.record('request_quest')
+        if self.quests.active >= 3:  # Limit active quests
+            self.message("Guard: 'You already have enough tasks. Complete some of your current quests first.'")
+            return None
+        new_quest = guard_quest(self.rng.stream('npc'))
+        self.message(f"New quest received: {new_quest.name}")
+        self.message(new_quest.description)
+        self.quests.append(new_quest)
+        return new_quest
+
+    def use_item(self, item_name):
+        self.journal.record('use_item', item_name)
+        chosen_item = self.find_item(item_name)
+        if chosen_item is None:
+            self.message("No usable items in inventory!")
+            return False
+        chosen_item.use(self.player)
+        self.player.inventory.remove_item(chosen_item)
+        self.message(f"Used {chosen_item.name}")
+        return True
+
+    def find_item(self, item_name):
+        return self.player.inventory.get(item_name)
+
+    def start_combat(self, enemy_name=None):
+        self.journal.record('start_combat', enemy_name)
+        current_location = self.current_location()
+        if current_location.boss:
+            enemy = current_location.boss
+            self.message(f"You encounter {enemy.name}, prepare for a boss battle!")
+        elif enemy_name in ENEMIES:
+            enemy = self.roll_enemy(enemy_name)
+        else:
+            return None
+        return self.begin_combat(enemy)
+
+    def roll_enemy(self, name):
+        rng = self.rng.stream('enemies')
+        return Character(name, None,
+                         strength=rng.randint(8, 15),
+                         intelligence=rng.randint(5, 15),
+                         charisma=rng.randint(5, 15),
+                         defense=rng.randint(3, 8))
+
+    def begin_combat(self, enemy, quiet=False):
+        # Quiet fights keep no turn records and don't open the combat screen
+        self.combat = CombatEngine(self.player, enemy, rng=self.rng.stream('combat'), record=not quiet)
+        if not quiet:
+            self.emit('combat_started', self.combat)
+        return self.combat
+
+    def ambush(self, enemy):
+        self.ambushed = True
+        if self.ambush_policy is None:
+            return self.begin_combat(enemy)
+        engine = self.begin_combat(enemy, quiet=True)
+        # The turns belong to the step that set the ambush off, and the policy
+        # is journaled, so a replay fights them out the same way by itself
+        while self.combat is not None:
+            self.fight_step(self.ambush_policy(engine))
+        self.message(engine.summary())
+        return engine
+
+    def set_ambush_policy(self, name):
+        # Takes a name from game.combat.POLICIES, or None to fight ambushes by hand
+        if name is not None and name not in POLICIES:
+            raise ValueError(f"Unknown combat policy: {name}")
+        self.journal.record('set_ambush_policy', name)
+        self.ambush_policy = POLICIES[name] if name is not None else None
+
+    def combat_step(self, action, item=None):
+        if self.combat is None:
+            return []
+        item_name = getattr(item, 'name', item)
+        self.journal.record('combat_step', action, item_name)
+        return self.fight_step(action, item_name)
+
+    def fight_step(self, action, item_name=None):
+        item = None
+        if item_name is not None:
+            item = self.find_item(item_name)
+        records = self.combat.step(action, item)
+        if self.combat.finished:
+            self.end_combat()
+        return records
+
+    def resolve_combat(self, policy):
+        engine = self.combat
+        while self.combat is not None:
+            self.combat_step(policy(self.combat))
+        return engine.result() if engine is not None else None
+
+    def end_combat(self):
+        engine, self.combat = self.combat, None
+        enemy = engine.enemy
+        self.message("Combat ended.")
+        if engine.fled:
+            self.message(f"You escaped from {enemy.name}.")
+        elif self.player.is_alive():
+            self.message(f"You defeated {enemy.name}!")
+            if isinstance(enemy, Boss):
+                self.message("You've defeated a powerful boss!")
+                # Add special rewards for defeating a boss
+                self.player.earn_gold(200)
+                self.message("You earned 200 gold for your victory!")
+        else:
+            self.message("You were defeated in combat.")
+        self.emit('combat_ended', engine)
+
+    def mass_battle(self, size=1000):
+        # The player's levies against whoever holds this place: the local boss
+        # and their host, or a rival house's soldiers out in the open
+        self.journal.record('mass_battle', size)
+        location = self.current_location()
+        if location.boss and not location.boss.is_alive():
+            self.message(f"{location.boss.name} has already fallen here.")
+            return None
+        host = Army(f"{self.player.name}'s host")
+        enemy = Army(location.boss.name if location.boss else "Rival House")
+        battle = MassBattle(host, enemy, seed=self.rng.stream('battle').randrange(1 << 64))
+        host.recruit(type(self.player)("Levy", self.player.house), size, battle.rng)
+        if location.boss:
+            enemy.add_leader(location.boss)
+        enemy.recruit(self.roll_enemy("Rival House Soldier"), size, battle.rng)
+
+        self.message(f"{size} of your men march against {enemy.name}!")
+        result = battle.resolve()
+        self.message(result.summary)
+        if result.winner is host:
+            self.player.earn_gold(100)
+            self.message("The spoils of war bring you 100 gold.")
+        self.emit('battle_ended', result)
+        return result
+
+    def check_for_events(self):
+        event = self.events.draw(self.current_location(), self.player, self.rng.stream('events'))
+        if event is not None:
+            self.message(event.message)
+            event.apply(self)
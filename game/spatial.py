@@ -0,0 +1,77 @@
+import math
+
+
+class SpatialHash:
+    # Buckets objects by grid cell so tile and radius queries only look at
+    # nearby cells. Objects carry their own position attribute; moving one
+    # only touches the buckets it leaves and enters.
+    def __init__(self, cell_size=16):
+        self.cell_size = cell_size
+        self.cells = {}  # (cx, cy) -> {obj: None}; dicts keep results in insertion order
+        self.tiles = {}  # (x, y) -> {obj: None}
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def cell(self, x, y):
+        return x // self.cell_size, y // self.cell_size
+
+    def insert(self, obj, position):
+        obj.position = position
+        self.cells.setdefault(self.cell(*position), {})[obj] = None
+        self.tiles.setdefault(position, {})[obj] = None
+        self.count += 1
+
+    def remove(self, obj):
+        position = obj.position
+        self.discard(self.cells, self.cell(*position), obj)
+        self.discard(self.tiles, position, obj)
+        self.count -= 1
+
+    def move(self, obj, position):
+        old = obj.position
+        if old == position:
+            return
+        self.discard(self.tiles, old, obj)
+        self.tiles.setdefault(position, {})[obj] = None
+        old_cell, new_cell = self.cell(*old), self.cell(*position)
+        if old_cell != new_cell:
+            self.discard(self.cells, old_cell, obj)
+            self.cells.setdefault(new_cell, {})[obj] = None
+        obj.position = position
+
+    def discard(self, buckets, key, obj):
+        bucket = buckets[key]
+        del bucket[obj]
+        if not bucket:
+            del buckets[key]
+
+    def at(self, x, y):
+        return list(self.tiles.get((x, y), ()))
+
+    def near(self, x, y, radius):
+        # Everything within Euclidean distance radius, nearest first
+        min_cx, min_cy = self.cell(x - radius, y - radius)
+        max_cx, max_cy = self.cell(x + radius, y + radius)
+        limit = radius * radius
+        if (max_cx - min_cx + 1) * (max_cy - min_cy + 1) > len(self.cells):
+            # Radius covers more cells than are occupied; walk the occupied ones
+            buckets = [bucket for (cx, cy), bucket in self.cells.items()
+                       if min_cx <= cx <= max_cx and min_cy <= cy <= max_cy]
+        else:
+            buckets = [self.cells.get((cx, cy), ()) for cy in range(min_cy, max_cy + 1)
+                       for cx in range(min_cx, max_cx + 1)]
+        found = []
+        for bucket in buckets:
+            for obj in bucket:
+                ox, oy = obj.position
+                distance = (ox - x) ** 2 + (oy - y) ** 2
+                if distance <= limit:
+                    found.append((distance, obj))
+        found.sort(key=lambda entry: entry[0])
+        return [obj for _, obj in found]
+
+
+def distance(a, b):
+    return math.hypot(a[0] - b[0], a[1] - b[1])
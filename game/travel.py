@@ -0,0 +1,86 @@
+import numpy as np
+
+# Step order also breaks ties between equally short routes
+STEPS = (('east', 1, 0), ('west', -1, 0), ('south', 0, 1), ('north', 0, -1))
+
+# Boards with more tiles than this get closed-form fields instead of arrays
+MAX_FIELD_TILES = 1 << 18
+MAX_CACHED_FIELDS = 256
+
+
+class DistanceField:
+    # Steps from every tile to one target. Every tile is walkable, so the
+    # field is the Manhattan distance; small boards keep it as an array so
+    # lookups are a single index, big ones compute it on demand.
+    def __init__(self, target, size):
+        if not (0 <= target[0] < size and 0 <= target[1] < size):
+            raise ValueError(f"{target} is not on the board")
+        self.target = target
+        self.size = size
+        self.grid = None
+        if size * size <= MAX_FIELD_TILES:
+            xs = np.abs(np.arange(size, dtype=np.int32) - target[0])
+            ys = np.abs(np.arange(size, dtype=np.int32) - target[1])
+            self.grid = ys[:, None] + xs[None, :]
+
+    def distance(self, x, y):
+        if self.grid is not None:
+            return int(self.grid[y, x])
+        return abs(x - self.target[0]) + abs(y - self.target[1])
+
+    def route(self, start):
+        x, y = start
+        if not (0 <= x < self.size and 0 <= y < self.size):
+            raise ValueError(f"{start} is not on the board")
+        if self.grid is None:
+            # Downhill on a Manhattan field is every horizontal step, then every vertical one
+            dx, dy = self.target[0] - x, self.target[1] - y
+            return ['east' if dx > 0 else 'west'] * abs(dx) + ['south' if dy > 0 else 'north'] * abs(dy)
+        # Walk downhill until the target is reached
+        directions = []
+        distance = self.distance(x, y)
+        while distance:
+            for direction, dx, dy in STEPS:
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < self.size and 0 <= ny < self.size and self.distance(nx, ny) < distance:
+                    x, y = nx, ny
+                    distance -= 1
+                    directions.append(direction)
+                    break
+            else:
+                raise ValueError(f"No route from {start} to {self.target}")
+        return directions
+
+
+class Pathfinder:
+    # Caches one distance field per destination. Fields are dropped whenever
+    # the board's version changes (a new layout or a restored save).
+    def __init__(self, board):
+        self.board = board
+        self.version = None
+        self.fields = {}
+
+    def field(self, target):
+        version = getattr(self.board, 'version', None)
+        if version != self.version:
+            self.fields.clear()
+            self.version = version
+        field = self.fields.get(target)
+        if field is None:
+            if len(self.fields) >= MAX_CACHED_FIELDS:
+                self.fields.clear()
+            field = self.fields[target] = DistanceField(target, self.board.size)
+        return field
+
+    def distance(self, start, target):
+        return self.field(target).distance(*start)
+
+    def route(self, start, target):
+        return self.field(target).route(start)
+
+    def destinations(self, start):
+        # Named places nearest first, as (position, location, distance)
+        places = [(position, location, self.distance(start, position))
+                  for position, location in self.board.named_positions().items()]
+        places.sort(key=lambda place: place[2])
+        return places
@@ -0,0 +1,170 @@
+import os
+import random
+import struct
+import tempfile
+from game.game_board import Location, assign_bosses, create_locations
+from game.spatial import SpatialHash
+from models.character import NPC, create_bosses
+from models.observable import Observable
+
+# On-disk chunk record: site count, then (cell index within chunk, location index) per site
+CHUNK_HEADER = struct.Struct('<H')
+CHUNK_SITE = struct.Struct('<HB')
+
+
+class StreamingWorld(Observable):
+    def __init__(self, seed=None, size=1_000_000, chunk_size=32, sites_per_chunk=2,
+                 load_radius=2, cache_dir=None):
+        super().__init__()
+        if chunk_size * chunk_size > 1 << 16:
+            raise ValueError("chunk_size must be at most 256")
+        self.seed = seed if seed is not None else random.randrange(1 << 32)
+        self.size = size
+        self.chunk_size = chunk_size
+        self.sites_per_chunk = sites_per_chunk
+        self.load_radius = load_radius
+        self.locations = create_locations()
+        self.wilderness = Location("Wilderness", "#4a6741")
+        self.bosses = create_bosses()
+        assign_bosses(self.locations, self.bosses)
+
+        self.chunks = {}  # (cx, cy) -> {(x, y): location} for loaded chunks
+        # Sites share Location objects, so each site gets its own resident NPCs
+        self.npcs = SpatialHash(cell_size=chunk_size)
+        self.chunk_npcs = {}  # (cx, cy) -> NPCs spawned with that chunk
+        # Evicted chunks are appended to a single cache file; index maps chunk -> offset
+        # A directory of our own is removed again by close()
+        self.temp_dir = None
+        if cache_dir is None:
+            self.temp_dir = tempfile.TemporaryDirectory(prefix="got_world_")
+            cache_dir = self.temp_dir.name
+        self.cache_dir = cache_dir
+        self.cache_path = os.path.join(self.cache_dir, f"chunks_{self.seed}.bin")
+        self.cache_index = {}
+        self.cache_file = None
+        self.generated = 0
+
+    def chunk_coords(self, x, y):
+        return x // self.chunk_size, y // self.chunk_size
+
+    def get_location(self, x, y):
+        coords = (x // self.chunk_size, y // self.chunk_size)
+        chunk = self.chunks.get(coords)
+        if chunk is None:
+            chunk = self.load_chunk(coords)
+        return chunk.get((x, y), self.wilderness)
+
+    def named_positions(self):
+        positions = {}
+        for chunk in self.chunks.values():
+            positions.update(chunk)
+        return positions
+
+    def follow(self, player):
+        player.subscribe('position_changed', lambda name, old, new: self.update_player_position(new))
+        self.update_player_position(player.position)
+
+    def update_player_position(self, position):
+        cx, cy = self.chunk_coords(*position)
+        radius = self.load_radius
+        last_chunk = (self.size - 1) // self.chunk_size
+        for y in range(max(0, cy - radius), min(last_chunk, cy + radius) + 1):
+            for x in range(max(0, cx - radius), min(last_chunk, cx + radius) + 1):
+                if (x, y) not in self.chunks:
+                    self.load_chunk((x, y))
+        # One chunk of slack so walking along a chunk border doesn't thrash
+        for coords in list(self.chunks):
+            if max(abs(coords[0] - cx), abs(coords[1] - cy)) > radius + 1:
+                self.evict_chunk(coords)
+
+    def load_chunk(self, coords):
+        if coords in self.cache_index:
+            chunk = self.read_chunk(coords)
+        else:
+            chunk = self.generate_chunk(*coords)
+        self.chunks[coords] = chunk
+        self.spawn_npcs(coords, chunk)
+        self.emit('chunk_loaded', coords, chunk)
+        return chunk
+
+    def spawn_npcs(self, coords, chunk):
+        residents = []
+        for position, location in chunk.items():
+            for npc in location.npcs:
+                resident = NPC(npc.name, npc.type)
+                self.npcs.insert(resident, position)
+                residents.append(resident)
+        self.chunk_npcs[coords] = residents
+
+    def generate_chunk(self, cx, cy):
+        # Seeding from the world seed and chunk coordinates makes every chunk
+        # reproducible regardless of the order chunks are visited in
+        rng = random.Random(f"{self.seed}:{cx}:{cy}")
+        chunk = {}
+        cells = rng.sample(range(self.chunk_size * self.chunk_size), self.sites_per_chunk)
+        for cell in cells:
+            x = cx * self.chunk_size + cell % self.chunk_size
+            y = cy * self.chunk_size + cell // self.chunk_size
+            location = self.locations[rng.randrange(len(self.locations))]
+            if x < self.size and y < self.size:
+                chunk[(x, y)] = location
+        self.generated += 1
+        return chunk
+
+    def evict_chunk(self, coords):
+        chunk = self.chunks.pop(coords)
+        for npc in self.chunk_npcs.pop(coords, ()):
+            self.npcs.remove(npc)
+        if coords not in self.cache_index:
+            self.write_chunk(coords, chunk)
+        self.emit('chunk_evicted', coords)
+
+    def write_chunk(self, coords, chunk):
+        if self.cache_file is None:
+            self.cache_file = open(self.cache_path, 'a+b')
+        origin_x = coords[0] * self.chunk_size
+        origin_y = coords[1] * self.chunk_size
+        data = bytearray(CHUNK_HEADER.pack(len(chunk)))
+        for (x, y), location in chunk.items():
+            cell = (y - origin_y) * self.chunk_size + (x - origin_x)
+            data += CHUNK_SITE.pack(cell, self.locations.index(location))
+        self.cache_file.seek(0, os.SEEK_END)
+        self.cache_index[coords] = (self.cache_file.tell(), len(data))
+        self.cache_file.write(data)
+
+    def read_chunk(self, coords):
+        offset, length = self.cache_index[coords]
+        self.cache_file.flush()
+        self.cache_file.seek(offset)
+        data = self.cache_file.read(length)
+        origin_x = coords[0] * self.chunk_size
+        origin_y = coords[1] * self.chunk_size
+        chunk = {}
+        for cell, index in CHUNK_SITE.iter_unpack(data[CHUNK_HEADER.size:]):
+            position = (origin_x + cell % self.chunk_size, origin_y + cell // self.chunk_size)
+            chunk[position] = self.locations[index]
+        return chunk
+
+    def add_npc(self, npc, position):
+        self.npcs.insert(npc, position)
+
+    def move_npc(self, npc, position):
+        self.npcs.move(npc, position)
+
+    def remove_npc(self, npc):
+        self.npcs.remove(npc)
+
+    def npcs_at(self, x, y):
+        return self.npcs.at(x, y)
+
+    def npcs_near(self, x, y, radius):
+        return self.npcs.near(x, y, radius)
+
+    def close(self):
+        if self.cache_file is not None:
+            self.cache_file.close()
+            self.cache_file = None
+        self.cache_index.clear()
+        if self.temp_dir is not None:
+            self.temp_dir.cleanup()
+            self.temp_dir = None
@@ -3,7 +3,7 @@ from PyQt5.QtWidgets import (
 )
 from PyQt5.QtGui import QFont
 from PyQt5.QtCore import Qt
-from models.character import Warrior, Diplomat, Maester
+from models.character import CHARACTER_CLASSES
 from models.house import House
 from gui.widgets import StyledQLabel
 
@@ -14,33 +14,7 @@ class CharacterCreationWindow(QWidget):
         self.on_character_created = on_character_created
         self.setWindowTitle("Create Your Character")
         self.setFixedSize(400, 500)
-        self.setStyleSheet("""
-            QWidget {
-                background-color: #2C3E50;  /* Dark blue-gray */
-                color: #ECF0F1;  /* Light gray */
-                font-family: 'Trajan Pro', serif;
-            }
-            QLineEdit, QComboBox {
-                background-color: #34495E;  /* Lighter blue-gray */
-                border: 2px solid #D4AF37;  /* Gold */
-                border-radius: 5px;
-                padding: 5px;
-                color: #ECF0F1;
-                font-size: 14px;
-            }
-            QPushButton {
-                background-color: #D4AF37;  /* Gold */
-                color: #2C3E50;  /* Dark blue-gray */
-                border: none;
-                padding: 10px;
-                font-size: 16px;
-                font-weight: bold;
-                border-radius: 5px;
-            }
-            QPushButton:hover {
-                background-color: #F1C40F;  /* Lighter gold */
-            }
-        """)
+        self.setAttribute(Qt.WA_StyledBackground, True)  # Let the theme paint the window
         
         self.init_ui()
 
@@ -67,7 +41,7 @@ class CharacterCreationWindow(QWidget):
         # Character Class Selection
         layout.addWidget(StyledQLabel("Choose your Class:"))
         self.class_combo = QComboBox()
-        self.class_combo.addItems(["Warrior", "Diplomat", "Maester"])
+        self.class_combo.addItems(list(CHARACTER_CLASSES))
         layout.addWidget(self.class_combo)
 
         # Create Character Button
@@ -88,13 +62,8 @@ class CharacterCreationWindow(QWidget):
         if name and house and character_class:
             house_obj = House(house, f"{house} Sigil", f"{house} Words")
             
-            if character_class == "Warrior":
-                character = Warrior(name, house_obj)
-            elif character_class == "Diplomat":
-                character = Diplomat(name, house_obj)
-            else:
-                character = Maester(name, house_obj)
-            
+            character = CHARACTER_CLASSES[character_class](name, house_obj)
+
             self.on_character_created(character)
             self.close()
         else:
@@ -105,16 +74,4 @@ class CharacterCreationWindow(QWidget):
         error_dialog.setIcon(QMessageBox.Warning)
         error_dialog.setText("Please fill in all fields.")
         error_dialog.setWindowTitle("Error")
-        error_dialog.setStyleSheet("""
-            QMessageBox {
-                background-color: #2C3E50;
-                color: #ECF0F1;
-            }
-            QMessageBox QPushButton {
-                background-color: #D4AF37;
-                color: #2C3E50;
-                padding: 5px 15px;
-                border-radius: 3px;
-            }
-        """)
         error_dialog.exec_()
\ No newline at end of file
@@ -1,12 +1,18 @@
-from PyQt5.QtWidgets import QDialog, QVBoxLayout, QLabel, QProgressBar, QPushButton, QTextEdit, QInputDialog, QMessageBox
-import random
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QProgressBar, QPushButton, QTextEdit,
+                             QInputDialog, QMessageBox, QComboBox)
+from game.combat import POLICIES, CombatEngine
 from models.character import Boss
 
 class CombatDialog(QDialog):
-    def __init__(self, player, enemy, parent=None):
+    def __init__(self, player, enemy, parent=None, engine=None, step=None, resolve=None):
         super().__init__(parent)
         self.player = player
         self.enemy = enemy
+        self.engine = engine or CombatEngine(player, enemy)
+        # Actions go through step and resolve so the caller can journal them
+        self.step = step or self.engine.step
+        self.resolve = resolve or self.engine.resolve
+        self.starting_health = player.health
         self.setWindowTitle("Combat")
         self.setModal(True)
         self.layout = QVBoxLayout()
@@ -37,6 +43,15 @@ class CombatDialog(QDialog):
             self.layout.addWidget(button)
             button.clicked.connect(self.handle_action)
 
+        auto_layout = QHBoxLayout()
+        self.policy_box = QComboBox()
+        self.policy_box.addItems(list(POLICIES))
+        auto_button = QPushButton('Auto-Resolve')
+        auto_button.clicked.connect(self.auto_resolve)
+        auto_layout.addWidget(self.policy_box)
+        auto_layout.addWidget(auto_button)
+        self.layout.addLayout(auto_layout)
+
         self.log = QTextEdit()
         self.log.setReadOnly(True)
         self.layout.addWidget(self.log)
@@ -49,89 +64,45 @@ class CombatDialog(QDialog):
             self.layout.addWidget(self.boss_ability_button)
 
     def use_boss_ability(self):
-        if isinstance(self.enemy, Boss):
-            result = self.enemy.use_special_ability(self.player)
-            self.log.append(result)
-            self.update_health_bars()
-            self.check_combat_end()
-            if self.player.is_alive():
-                self.enemy_turn()
+        self.render(self.step('boss_ability'))
 
     def handle_action(self):
-        action = self.sender().text().lower()
-        if action == 'attack':
-            self.player_attack()
-        elif action == 'defend':
-            self.player_defend()
-        elif action == 'use_item':
+        action = self.sender().text().lower().replace(' ', '_')
+        if action == 'use_item':
             self.use_item()
-        elif action == 'flee':
-            self.flee()
-
-        if self.enemy.is_alive() and self.player.is_alive():
-            self.enemy_turn()
-
-        self.update_health_bars()
-        self.check_combat_end()
-
-
-    def player_defend(self):
-        self.player.defending = True
-        self.log.append(f"{self.player.name} takes a defensive stance.")
+        else:
+            self.render(self.step(action))
 
     def use_item(self):
-        items = [item for item in self.player.inventory.items if item.combat_usable]
-        if not items:
+        inventory = self.player.inventory
+        if not len(inventory):
             self.log.append("No usable items in inventory!")
             return
-        item_names = [item.name for item in items]
+        item_names = list(inventory.stacks)
         item, ok = QInputDialog.getItem(self, "Use Item", "Choose an item to use:", item_names, 0, False)
         if ok and item:
-            chosen_item = next(i for i in items if i.name == item)
-            chosen_item.use(self.player)
-            self.player.inventory.remove_item(chosen_item)
-            self.update_character_info()  # Update character info after using item
-            self.update_inventory()
-            self.dialogue_box.append(f"Used {chosen_item.name}")
-
-    def flee(self):
-        if random.random() < 0.5:
-            self.log.append(f"{self.player.name} successfully fled from combat!")
-            self.accept()
-        else:
-            self.log.append(f"{self.player.name} failed to flee!")
-
-    def check_combat_end(self):
-        if not self.player.is_alive():
-            self.log.append(f"{self.player.name} has been defeated!")
-            self.finish_combat(victor=self.enemy)
-        elif not self.enemy.is_alive():
-            self.log.append(f"{self.enemy.name} has been defeated!")
-            self.finish_combat(victor=self.player)
-
-    def finish_combat(self, victor):
-        if victor == self.player:
-            reward = random.randint(10, 50)
-            self.player.earn_gold(reward)
-            self.log.append(f"{self.player.name} wins! Earned {reward} gold.")
-        QMessageBox.information(self, "Combat Ended", self.log.toPlainText())
-        self.accept()
+            self.render(self.step('use_item', inventory.get(item)))
 
-    def player_attack(self):
-        damage = max(1, self.player.strength - self.enemy.defense)
-        self.enemy.take_damage(damage)
-        self.log.append(f"{self.player.name} attacks for {damage} damage!")
+    def render(self, records):
+        for record in records:
+            self.log.append(record.message)
         self.update_health_bars()
+        if self.engine.fled:
+            self.accept()
+        elif self.engine.finished:
+            self.finish_combat()
 
-    def enemy_turn(self):
-        if self.player.defending:
-            damage = max(1, (self.enemy.strength // 2) - self.player.defense)
-            self.player.defending = False
-        else:
-            damage = max(1, self.enemy.strength - self.player.defense)
-        self.player.take_damage(damage)
-        self.log.append(f"{self.enemy.name} attacks for {damage} damage!")
+    def auto_resolve(self):
+        # The whole fight runs without touching the widgets; only the outcome is shown
+        self.resolve(POLICIES[self.policy_box.currentText()])
         self.update_health_bars()
+        self.finish_combat()
+
+    def finish_combat(self):
+        lost = self.starting_health - self.player.health
+        QMessageBox.information(self, "Combat Ended",
+                                f"{self.engine.summary()}\nHealth lost: {max(0, lost)}")
+        self.accept()
 
     def update_health_bars(self):
         self.player_health.setValue(self.player.health)
@@ -0,0 +1,101 @@
+from collections import deque
+from PyQt5.QtCore import QAbstractListModel, QModelIndex, Qt, QTimer
+from PyQt5.QtWidgets import QAbstractItemView, QListView
+
+
+class EventLogModel(QAbstractListModel):
+    # Keeps the newest `capacity` lines in a ring buffer. Appends are queued
+    # and handed to the view once per frame, and lines that fall off the front
+    # can be spilled to a file so the full history isn't lost.
+    def __init__(self, capacity=1000, spill_path=None, parent=None):
+        super().__init__(parent)
+        self.lines = deque(maxlen=capacity)
+        self.pending = []
+        self.spill_file = open(spill_path, 'a', encoding='utf-8') if spill_path else None
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.setInterval(16)
+        self.flush_timer.timeout.connect(self.flush)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.lines)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.lines):
+            return None
+        if role in (Qt.DisplayRole, Qt.ToolTipRole):
+            return self.lines[index.row()]
+        return None
+
+    def append(self, text):
+        self.pending.extend(str(text).split('\n'))
+        if not self.flush_timer.isActive():
+            self.flush_timer.start()
+
+    def flush(self):
+        if not self.pending:
+            return
+        capacity = self.lines.maxlen
+        # A burst bigger than the buffer only ever shows its tail
+        skipped, pending = self.pending[:-capacity], self.pending[-capacity:]
+        self.pending = []
+        overflow = len(self.lines) + len(pending) - capacity
+        if overflow > 0:
+            self.beginRemoveRows(QModelIndex(), 0, overflow - 1)
+            dropped = [self.lines.popleft() for _ in range(overflow)]
+            self.endRemoveRows()
+            self.spill(dropped)
+        if skipped:
+            self.spill(skipped)
+        first = len(self.lines)
+        self.beginInsertRows(QModelIndex(), first, first + len(pending) - 1)
+        self.lines.extend(pending)
+        self.endInsertRows()
+
+    def spill(self, lines):
+        if self.spill_file is not None:
+            self.spill_file.write('\n'.join(lines) + '\n')
+
+    def text(self):
+        return '\n'.join(list(self.lines) + self.pending)
+
+    def close(self):
+        self.flush()
+        if self.spill_file is not None:
+            # Whatever is still on screen belongs to the history too
+            self.spill(self.lines)
+            self.spill_file.close()
+            self.spill_file = None
+
+
+class EventLogView(QListView):
+    def __init__(self, capacity=1000, spill_path=None, parent=None):
+        super().__init__(parent)
+        self.log_model = EventLogModel(capacity, spill_path, self)
+        self.setModel(self.log_model)
+        # Uniform rows let the view lay out only what is on screen
+        self.setUniformItemSizes(True)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setSelectionMode(QAbstractItemView.NoSelection)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.at_bottom = True
+        self.log_model.rowsAboutToBeInserted.connect(self.check_bottom)
+        self.log_model.rowsInserted.connect(self.follow)
+
+    def append(self, text):
+        self.log_model.append(text)
+
+    def toPlainText(self):
+        return self.log_model.text()
+
+    def check_bottom(self, *args):
+        scroll_bar = self.verticalScrollBar()
+        self.at_bottom = scroll_bar.value() >= scroll_bar.maximum()
+
+    def follow(self, *args):
+        # Stay on the newest line unless the user scrolled up to read
+        if self.at_bottom:
+            self.scrollToBottom()
+
+    def close_log(self):
+        self.log_model.close()
@@ -1,63 +1,46 @@
 from PyQt5.QtWidgets import (QMainWindow, QWidget, QHBoxLayout, QVBoxLayout, QLabel, QGridLayout,
-                                QPushButton, QFrame, QInputDialog, QListWidget, QTextEdit, QDialog)
-from PyQt5.QtGui import QFont
+                                QPushButton, QInputDialog, QCheckBox, QShortcut)
+from PyQt5.QtGui import QFont, QKeySequence
 from PyQt5.QtCore import Qt
-import random
 
 from gui.combat_dialog import CombatDialog
+from gui.event_log import EventLogView
+from gui.profiler_overlay import ProfilerOverlay
+from gui.theme import swatch
+from gui.map_widget import GameMapWidget, MinimapWidget
 from gui.widgets import StyledListWidget, CharacterInfoWidget
-from gui.widgets import StyledTextEdit, StyledButton  
-from game.game_board import GameBoard
-from models.quest import Quest
-from models.inventory import Item
-from models.character import Character, Boss
+from game.items import merchant_stock
+from game.profiler import Profiler
+from game.session import ENEMIES
+from game.spatial import distance
+
+NEARBY_RADIUS = 10
 
 class GameGUI(QMainWindow):
-    def __init__(self, player):
+    def __init__(self, session, log_path=None, profiler=None):
         super().__init__()
-        self.player = player
-        self.game_board = GameBoard()
-        self.quests = [
-            Quest("The King's Errand", 
-                  "Deliver a message to the Night's Watch.", 
-                  lambda p: p.earn_gold(100),
-                  lambda p: p.position == (5, 5)),
-            Quest("Dragon's Egg", 
-                  "Find a dragon egg in Dragonstone.", 
-                  lambda p: p.inventory.add_item(Item("Dragon Egg", 1000, lambda x: None)),
-                  lambda p: any(item.name == "Dragon Egg" for item in p.inventory.items)),
-            Quest("Defend the Wall", 
-                  "Help the Night's Watch defend against wildlings.", 
-                  lambda p: setattr(p, 'strength', p.strength + 2),
-                  lambda p: p.position == (0, 9) and p.strength > 12)
-        ]
+        # All game rules live in the headless session; the window only asks
+        # the player for choices and renders the resulting state changes
+        self.session = session
+        self.player = session.player
+        self.game_board = session.game_board
+        self.quests = session.quests
+        self.travelling = False
+        self.log_path = log_path
+        self.profiler = profiler or Profiler()
+        # Time spent waiting in a dialog is left out of the handler timings
+        self.choose = self.profiler.wrap_wait(self.choose)
+        self.profiler.instrument(self, ['move_player', 'interact_with_npc', 'initiate_combat', 'use_item'],
+                                 'handler.')
         self.initUI()
+        self.connect_model()
+        if self.profiler.enabled:
+            self.profiler_overlay = ProfilerOverlay(self.profiler, self)
+            QShortcut(QKeySequence(Qt.Key_F3), self, self.profiler_overlay.toggle)
 
     def initUI(self):
         self.setWindowTitle('Game of Thrones RPG')
         self.setGeometry(100, 100, 1000, 600)
-        self.setStyleSheet("""
-            QMainWindow {
-                background-color: #2c3e50;
-                color: #ecf0f1;
-            }
-            QLabel {
-                color: #ecf0f1;
-                font-size: 14px;
-            }
-            QListWidget {
-                background-color: #34495e;
-                color: #ecf0f1;
-                border: 1px solid #7f8c8d;
-                border-radius: 5px;
-            }
-            QTextEdit {
-                background-color: #34495e;
-                color: #ecf0f1;
-                border: 1px solid #7f8c8d;
-                border-radius: 5px;
-            }
-        """)
 
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
@@ -87,50 +70,56 @@ class GameGUI(QMainWindow):
         self.npc_list = StyledListWidget()
         left_panel.addWidget(self.npc_list)
 
-        # Center panel: Game board
+        # Center panel: Game board viewport around the player
         center_panel = QVBoxLayout()
-        self.game_map = QGridLayout()
-        self.update_game_map()
-        center_panel.addLayout(self.game_map)
+        self.game_map = GameMapWidget(self.game_board, self.player)
+        center_panel.addWidget(self.game_map)
+
+        # Minimap of the whole board
+        left_panel.addWidget(QLabel("Map:"))
+        self.minimap = MinimapWidget(self.game_board, self.game_map)
+        left_panel.addWidget(self.minimap)
 
         # Action buttons
         # Action buttons
         action_layout = QGridLayout()
         action_buttons = {
             'move': QPushButton('🧭 Move'),
+            'travel': QPushButton('🗺️ Travel'),
             'interact': QPushButton('🤝 Interact with NPC'),
             'use_item': QPushButton('🎒 Use Item'),
             'view_quests': QPushButton('📜 View Quests'),
-            'initiate_combat': QPushButton('⚔️ Initiate Combat')
+            'initiate_combat': QPushButton('⚔️ Initiate Combat'),
+            'mass_battle': QPushButton('🛡️ Mass Battle')
         }
         for button in action_buttons.values():
             button.setFont(QFont("Segoe UI Emoji", 12))
-            button.setStyleSheet("""                
-                QPushButton {
-                background-color: #D4AF37;  /* Gold */
-                color: #2C3E50;  /* Dark blue-gray */
-                border: none;
-                padding: 10px;
-                font-size: 16px;
-                font-weight: bold;
-                border-radius: 5px;
-                }                                          
-                QPushButton:hover {
-                background-color: #F1C40F;  /* Lighter gold */
-                }
-            """)
+            button.setObjectName("ActionButton")
 
         action_layout.addWidget(action_buttons['move'], 0, 0)
-        action_layout.addWidget(action_buttons['interact'], 0, 1)
-        action_layout.addWidget(action_buttons['use_item'], 1, 0)
-        action_layout.addWidget(action_buttons['view_quests'], 1, 1)
-        action_layout.addWidget(action_buttons['initiate_combat'], 2, 0, 1, 2)
-
-        action_buttons['move'].clicked.connect(self.show_move_options)
-        action_buttons['interact'].clicked.connect(self.interact_with_npc)
-        action_buttons['use_item'].clicked.connect(self.use_item)
-        action_buttons['view_quests'].clicked.connect(self.view_quests)
-        action_buttons['initiate_combat'].clicked.connect(self.initiate_combat)
+        action_layout.addWidget(action_buttons['travel'], 0, 1)
+        action_layout.addWidget(action_buttons['interact'], 1, 0)
+        action_layout.addWidget(action_buttons['use_item'], 1, 1)
+        action_layout.addWidget(action_buttons['view_quests'], 2, 0)
+        action_layout.addWidget(action_buttons['initiate_combat'], 2, 1)
+        action_layout.addWidget(action_buttons['mass_battle'], 3, 0, 1, 2)
+
+        # clicked(bool) would hand its flag to the handler, and a profiled
+        # handler takes whatever it's given, so the slots take no arguments
+        action_buttons['move'].clicked.connect(lambda: self.show_move_options())
+        action_buttons['travel'].clicked.connect(lambda: self.show_travel_options())
+        action_buttons['interact'].clicked.connect(lambda: self.interact_with_npc())
+        action_buttons['use_item'].clicked.connect(lambda: self.use_item())
+        action_buttons['view_quests'].clicked.connect(lambda: self.view_quests())
+        action_buttons['initiate_combat'].clicked.connect(lambda: self.initiate_combat())
+        action_buttons['mass_battle'].clicked.connect(lambda: self.initiate_mass_battle())
+        self.action_buttons = action_buttons
+
+        # Ambushes are settled on the spot and reported in the event log
+        self.auto_ambush = QCheckBox("Auto-resolve ambushes")
+        self.auto_ambush.toggled.connect(self.set_auto_ambush)
+        self.auto_ambush.setChecked(True)
+        action_layout.addWidget(self.auto_ambush, 4, 0, 1, 2)
 
         center_panel.addLayout(action_layout)
 
@@ -140,8 +129,7 @@ class GameGUI(QMainWindow):
         right_panel.addWidget(QLabel("Quests:"))
         right_panel.addWidget(self.quest_list)
 
-        self.dialogue_box = StyledTextEdit()
-        self.dialogue_box.setReadOnly(True)
+        self.dialogue_box = EventLogView(spill_path=self.log_path)
         right_panel.addWidget(QLabel("Events:"))
         right_panel.addWidget(self.dialogue_box)
 
@@ -154,80 +142,116 @@ class GameGUI(QMainWindow):
         self.update_quests()
         self.update_available_npcs()
 
+    def connect_model(self):
+        # Widgets only refresh when the state they show actually changes.
+        # Each handler is timed under its section when profiling is on.
+        timed = self.profiler.wrap
+        self.player.subscribe('position_changed', timed('gui.map', self.on_position_changed))
+        self.player.subscribe('stats_changed', timed('gui.character_info', self.char_info_widget.update_stat))
+        self.player.subscribe('health_changed', timed('gui.character_info', self.on_health_changed))
+        self.player.subscribe('gold_changed', timed('gui.character_info', self.char_info_widget.update_gold))
+        self.player.inventory.subscribe('item_added', timed('gui.inventory', self.update_inventory))
+        self.player.inventory.subscribe('item_removed', timed('gui.inventory', self.update_inventory))
+        self.quests.subscribe('quest_added', timed('gui.quest_refresh', self.update_quests))
+        self.quests.subscribe('quest_completed', timed('gui.quest_refresh', self.on_quest_completed))
+        self.session.subscribe('message', timed('gui.event_log', self.dialogue_box.append))
+        # The combat dialog waits on the player, so it is kept out of every timing
+        self.session.subscribe('combat_started', self.profiler.wrap_wait(self.start_combat))
+        self.session.subscribe('travel_started', self.on_travel_started)
+        self.session.subscribe('travel_ended', timed('gui.map', self.on_travel_ended))
+
+    def on_position_changed(self, *args):
+        # While travelling the map is only redrawn once the journey ends
+        if self.travelling:
+            return
+        self.update_game_map()
+        self.update_available_npcs()
 
-    def update_game_map(self):
-        for i in reversed(range(self.game_map.count())): 
-            self.game_map.itemAt(i).widget().setParent(None)
-
-        for y in range(self.game_board.size):
-            for x in range(self.game_board.size):
-                location = self.game_board.get_location(x, y)
-                label = QLabel(location.name[0])
-                label.setAlignment(Qt.AlignCenter)
-                label.setStyleSheet(f"""
-                    background-color: {location.color};
-                    color: black;
-                    border: 1px solid black;
-                    font-weight: bold;
-                    min-width: 30px;
-                    min-height: 30px;
-                """)
-                if self.player and (x, y) == self.player.position:
-                    label.setStyleSheet(label.styleSheet() + "border: 2px solid red;")
-                self.game_map.addWidget(label, y, x)
+    def on_travel_started(self, route):
+        self.travelling = True
+
+    def on_travel_ended(self, position):
+        self.travelling = False
+        self.on_position_changed()
 
+    def on_health_changed(self, *args):
+        self.char_info_widget.update_health()
+        if not self.player.is_alive():
+            self.dialogue_box.append("Game Over!")
+
+    def on_quest_completed(self, quest):
+        self.dialogue_box.append(f"Quest completed: {quest.name}")
+        self.update_quests()
+
+    def update_game_map(self):
+        self.game_map.set_player_position(self.player.position)
+        self.minimap.set_player_position(self.player.position)
 
     def update_location_legend(self):
         for i, location in enumerate(self.game_board.locations + [self.game_board.wilderness]):
             color_label = QLabel()
-            color_label.setStyleSheet(f"background-color: {location.color}; border: 1px solid black;")
+            color_label.setPixmap(swatch(location.color))
             color_label.setFixedSize(20, 20)
             self.location_legend.addWidget(color_label, i, 0)
             self.location_legend.addWidget(QLabel(location.name), i, 1)
 
+    def choose(self, title, label, options, current=0):
+        return QInputDialog.getItem(self, title, label, options, current, False)
+
+    def set_auto_ambush(self, enabled):
+        self.session.set_ambush_policy('Cautious' if enabled else None)
+
     def show_move_options(self):
         directions = ['North', 'South', 'East', 'West']
-        direction, ok = QInputDialog.getItem(self, "Move", "Choose a direction:", directions, 0, False)
+        direction, ok = self.choose("Move", "Choose a direction:", directions)
         if ok and direction:
             self.move_player(direction.lower())
 
     def move_player(self, direction):
-        x, y = self.player.position
-        if direction == 'north' and y > 0:
-            self.player.position = (x, y - 1)
-        elif direction == 'south' and y < self.game_board.size - 1:
-            self.player.position = (x, y + 1)
-        elif direction == 'west' and x > 0:
-            self.player.position = (x - 1, y)
-        elif direction == 'east' and x < self.game_board.size - 1:
-            self.player.position = (x + 1, y)
+        self.session.move(direction)
 
-        self.update_game_map()
-        self.check_for_events()
-        self.update_available_npcs()  # Update NPC list after moving
+    def show_travel_options(self):
+        destinations = [place for place in self.session.pathfinder.destinations(self.player.position) if place[2]]
+        if not destinations:
+            self.dialogue_box.append("There is nowhere to travel to.")
+            return
+        labels = [f"{location.name} at {position} - {distance} tiles" for position, location, distance in destinations]
+        choice, ok = self.choose("Travel", "Choose a destination:", labels)
+        if ok and choice:
+            position, location, distance = destinations[labels.index(choice)]
+            if self.session.travel(*position):
+                self.dialogue_box.append(f"You arrive at {location.name}.")
+            else:
+                self.dialogue_box.append(f"Your journey to {location.name} was cut short.")
 
     def update_available_npcs(self):
         self.npc_list.clear()
-        current_location = self.game_board.get_location(*self.player.position)
-        if current_location.name != "Wilderness":
-            for npc in current_location.npcs:
-                self.npc_list.addItem(f"{npc.name} ({npc.type})")
-        else:
+        x, y = self.player.position
+        npcs = self.game_board.npcs_at(x, y)
+        for npc in npcs:
+            self.npc_list.addItem(f"{npc.name} ({npc.type})")
+        if npcs:
+            return
+        if self.game_board.get_location(x, y).name == "Wilderness":
             self.npc_list.addItem("No NPCs in the wilderness")
+        # Point the player at whoever is closest
+        for npc in self.game_board.npcs_near(x, y, NEARBY_RADIUS)[:3]:
+            tiles = round(distance(npc.position, (x, y)))
+            self.npc_list.addItem(f"{npc.name} ({npc.type}) - {tiles} tile{'s' if tiles != 1 else ''} away")
 
     def interact_with_npc(self):
         current_location = self.game_board.get_location(*self.player.position)
-        if current_location.name == "Wilderness":
+        available_npcs = self.game_board.npcs_at(*self.player.position)
+        if not available_npcs and current_location.name == "Wilderness":
             self.dialogue_box.append("There are no NPCs in the wilderness.")
             return
 
-        available_npcs = current_location.npcs
         if not available_npcs:
             self.dialogue_box.append(f"There are no NPCs available in {current_location.name}.")
             return
 
         npc_names = [f"{npc.name} ({npc.type})" for npc in available_npcs]
-        npc, ok = QInputDialog.getItem(self, "Interact", f"Choose an NPC in {current_location.name}:", npc_names, 0, False)
+        npc, ok = self.choose("Interact", f"Choose an NPC in {current_location.name}:", npc_names)
         
         if ok and npc:
             chosen_npc = available_npcs[npc_names.index(npc)]
@@ -241,191 +265,104 @@ class GameGUI(QMainWindow):
     def interact_with_merchant(self, merchant):
         self.dialogue_box.append(f"{merchant.name}: 'Welcome! What would you like to do?'")
         options = ['Buy', 'Sell', 'Exit']
-        choice, ok = QInputDialog.getItem(self, merchant.name, "Choose an action:", options, 0, False)
+        choice, ok = self.choose(merchant.name, "Choose an action:", options)
         
         if ok and choice == 'Buy':
-            items_for_sale = [
-                Item("Health Potion", 50, lambda p: setattr(p, 'health', min(100, p.health + 30))),
-                Item("Strength Potion", 100, lambda p: setattr(p, 'strength', p.strength + 5)),
-                Item("Shield", 150, lambda p: setattr(p, 'defense', p.defense + 5))
-            ]
+            items_for_sale = merchant_stock()
             item_names = [f"{item.name} ({item.value} gold)" for item in items_for_sale]
-            item, ok = QInputDialog.getItem(self, "Buy", "Choose an item to buy:", item_names, 0, False)
+            item, ok = self.choose("Buy", "Choose an item to buy:", item_names)
             
             if ok and item:
                 chosen_item = items_for_sale[item_names.index(item)]
-                if self.player.gold >= chosen_item.value:
-                    self.player.gold -= chosen_item.value
-                    self.player.inventory.add_item(chosen_item)
-                    self.dialogue_box.append(f"You bought {chosen_item.name} for {chosen_item.value} gold.")
-                    self.update_inventory()
-                    self.update_character_info()
-                else:
-                    self.dialogue_box.append("Not enough gold to buy this item.")
+                self.session.buy(chosen_item.name)
         
         elif ok and choice == 'Sell':
-            if not self.player.inventory.items:
+            if not len(self.player.inventory):
                 self.dialogue_box.append("You have no items to sell.")
             else:
-                item_names = [f"{item.name} ({item.value//2} gold)" for item in self.player.inventory.items]
-                item, ok = QInputDialog.getItem(self, "Sell", "Choose an item to sell:", item_names, 0, False)
+                items = [item for item, count in self.player.inventory]
+                item_names = [f"{item.name} ({item.value//2} gold)" for item in items]
+                item, ok = self.choose("Sell", "Choose an item to sell:", item_names)
                 
                 if ok and item:
-                    chosen_item = self.player.inventory.items[item_names.index(item)]
-                    self.player.gold += chosen_item.value // 2
-                    self.player.inventory.remove_item(chosen_item)
-                    self.dialogue_box.append(f"You sold {chosen_item.name} for {chosen_item.value//2} gold.")
-                    self.update_inventory()
-                    self.update_character_info()
+                    chosen_item = items[item_names.index(item)]
+                    self.session.sell(chosen_item.name)
 
     def interact_with_innkeeper(self, innkeeper):
         self.dialogue_box.append(f"{innkeeper.name}: 'Need a room for the night?'")
         options = ['Rest (20 gold)', 'Exit']
-        choice, ok = QInputDialog.getItem(self, innkeeper.name, "Choose an action:", options, 0, False)
+        choice, ok = self.choose(innkeeper.name, "Choose an action:", options)
         
         if ok and choice == 'Rest (20 gold)':
-            if self.player.gold >= 20:
-                self.player.gold -= 20
-                health_recovered = min(100 - self.player.health, 50)
-                self.player.health += health_recovered
-                self.dialogue_box.append(f"You rested for the night and recovered {health_recovered} health.")
-                self.update_character_info()
-            else:
-                self.dialogue_box.append("Not enough gold to rest for the night.")
+            self.session.rest()
 
     def interact_with_guard(self, guard):
         self.dialogue_box.append(f"{guard.name}: 'Move along, citizen. Nothing to see here.'")
         options = ['Ask for Information', 'Request Quest', 'Exit']
-        choice, ok = QInputDialog.getItem(self, guard.name, "Choose an action:", options, 0, False)
+        choice, ok = self.choose(guard.name, "Choose an action:", options)
         
         if ok and choice == 'Ask for Information':
-            information = [
-                "I heard rumors of a dragon sighting near Dragonstone.",
-                "The Lannisters are plotting something in King's Landing.",
-                "Winter is coming, and the Night's Watch needs more men.",
-                "There's unrest in the Iron Islands."
-            ]
-            info = random.choice(information)
-            self.dialogue_box.append(f"Guard: '{info}'")
+            self.session.ask_information()
         
         elif ok and choice == 'Request Quest':
-            if len([q for q in self.quests if not q.completed]) < 3:  # Limit active quests
-                new_quest = random.choice([
-                    Quest("Patrol the Walls", "Help the city guard patrol the walls.", 
-                          lambda p: p.earn_gold(75), lambda p: p.position == (3, 3)),
-                    Quest("Deliver a Message", "Deliver a confidential message to the Maester.", 
-                          lambda p: p.inventory.add_item(Item("Rare Book", 100, lambda x: None)), 
-                          lambda p: p.position == (7, 7)),
-                    Quest("Investigate Rumors", "Investigate rumors of bandits in the nearby forest.", 
-                          lambda p: setattr(p, 'strength', p.strength + 3), 
-                          lambda p: any(item.name == "Bandit's Emblem" for item in p.inventory.items))
-                ])
-                self.quests.append(new_quest)
-                self.dialogue_box.append(f"New quest received: {new_quest.name}")
-                self.dialogue_box.append(new_quest.description)
-                self.update_quests()
-            else:
-                self.dialogue_box.append("Guard: 'You already have enough tasks. Complete some of your current quests first.'")
+            self.session.request_quest()
 
     def use_item(self):
-        items = [item for item in self.player.inventory.items]
-        if not items:
+        item_names = list(self.player.inventory.stacks)
+        if not item_names:
             self.dialogue_box.append("No usable items in inventory!")
             return
-        item_names = [item.name for item in items]
-        item, ok = QInputDialog.getItem(self, "Use Item", "Choose an item to use:", item_names, 0, False)
+        item, ok = self.choose("Use Item", "Choose an item to use:", item_names)
         if ok and item:
-            chosen_item = next(i for i in items if i.name == item)
-            chosen_item.use(self.player)
-            self.player.inventory.remove_item(chosen_item)
-            self.update_character_info()  # Update character info after using item
-            self.update_inventory()
-            self.dialogue_box.append(f"Used {chosen_item.name}")
+            self.session.use_item(item)
 
 
 
     def view_quests(self):
-        quest_info = ""
         for quest in self.quests:
             status = "Completed" if quest.completed else "Active"
-            quest_info += f"{quest.name} - {status}\n{quest.description}\n\n"
-        self.dialogue_box.setText(quest_info)
+            self.dialogue_box.append(f"{quest.name} - {status}: {quest.description}")
 
 
     def initiate_combat(self):
-        current_location = self.game_board.get_location(*self.player.position)
-        if current_location.boss:
-            enemy = current_location.boss
-            self.dialogue_box.append(f"You encounter {enemy.name}, prepare for a boss battle!")
+        if self.session.current_location().boss:
+            self.session.start_combat()
         else:
-            enemies = ['Bandit', 'Wild Animal', 'Rival House Soldier']
-            enemy_name, ok = QInputDialog.getItem(self, "Combat", "Choose an enemy to fight:", enemies, 0, False)
-            if not (ok and enemy_name):
-                return
-            enemy = Character(enemy_name, None, 
-                              strength=random.randint(8, 15),
-                              intelligence=random.randint(5, 15), 
-                              charisma=random.randint(5, 15), 
-                              defense=random.randint(3, 8))
-        self.start_combat(enemy)
-
-
-    def start_combat(self, enemy):
-        combat_dialog = CombatDialog(self.player, enemy, self)
-        result = combat_dialog.exec_()
-        if result == QDialog.Accepted:
-            self.update_character_info()
-            self.update_inventory()
-            self.dialogue_box.append("Combat ended.")
-            if self.player.is_alive():
-                self.dialogue_box.append(f"You defeated {enemy.name}!")
-                if isinstance(enemy, Boss):
-                    self.dialogue_box.append("You've defeated a powerful boss!")
-                    # Add special rewards for defeating a boss
-                    self.player.earn_gold(200)
-                    self.dialogue_box.append("You earned 200 gold for your victory!")
-            else:
-                self.dialogue_box.append("You were defeated in combat.")
-        
-        combat_dialog.deleteLater()  # Ensure the dialog is properly destroyed
+            enemy_name, ok = self.choose("Combat", "Choose an enemy to fight:", ENEMIES)
+            if ok and enemy_name:
+                self.session.start_combat(enemy_name)
 
-    def check_for_events(self):
-        location = self.game_board.get_location(*self.player.position)
-        if location.trigger_event():
-            self.trigger_random_event()
-
-
-    def trigger_random_event(self):
-        events = [
-            ("You find a bag of gold!", lambda: self.player.earn_gold(50)),
-            ("You are ambushed by bandits!", self.trigger_combat_event),
-            ("You discover an ancient artifact!", lambda: self.player.inventory.add_item(Item("Ancient Artifact", 200, lambda x: None))),
-            ("A kind stranger offers you food and rest.", lambda: setattr(self.player, 'health', min(100, self.player.health + 10))),
-        ]
-        event, effect = random.choice(events)
-        self.dialogue_box.append(event)
-        effect()
-        self.update_character_info()
-        self.update_inventory()
 
-    def trigger_combat_event(self):
-        enemy = Character("Bandit", None, 
-                          strength=random.randint(8, 15),
-                          intelligence=random.randint(5, 15), 
-                          charisma=random.randint(5, 15), 
-                          defense=random.randint(3, 8))
-        self.start_combat(enemy)
+    def initiate_mass_battle(self):
+        sizes = ['100', '1000', '5000']
+        size, ok = self.choose("Mass Battle", "How many men do you lead?", sizes, 1)
+        if ok and size:
+            self.session.mass_battle(int(size))
+
+
+    def start_combat(self, engine):
+        if self.travelling:
+            self.update_game_map()  # Show where the ambush happened
+        combat_dialog = CombatDialog(self.player, engine.enemy, self, engine=engine,
+                                     step=self.session.combat_step, resolve=self.session.resolve_combat)
+        combat_dialog.exec_()
+        combat_dialog.deleteLater()  # Ensure the dialog is properly destroyed
+
 
+    def closeEvent(self, event):
+        self.dialogue_box.close_log()
+        super().closeEvent(event)
 
     def update_character_info(self):
         self.char_info_widget.update_info()
         
-    def update_inventory(self):
+    def update_inventory(self, *args):
         self.inventory_list.clear()
-        for item in self.player.inventory.items:
-            self.inventory_list.addItem(f"{item.name} (Value: {item.value})")
+        for item, count in self.player.inventory:
+            label = f"{item.name} x{count}" if count > 1 else item.name
+            self.inventory_list.addItem(f"{label} (Value: {item.value})")
 
-    def update_quests(self):
+    def update_quests(self, *args):
         self.quest_list.clear()
         for quest in self.quests:
             status = "Completed" if quest.completed else "Active"
@@ -0,0 +1,186 @@
+import math
+from PyQt5.QtCore import Qt, QPointF, QRect, QRectF, QSize, QTimer
+from PyQt5.QtGui import QColor, QFont, QImage, QPainter, QPen, QPixmap
+from PyQt5.QtWidgets import QSizePolicy, QWidget
+
+
+class GameMapWidget(QWidget):
+    def __init__(self, game_board, player, view_tiles=15, parent=None):
+        super().__init__(parent)
+        self.game_board = game_board
+        self.player = player
+        self.player_position = player.position
+        self.view_tiles = min(view_tiles, game_board.size)
+        self.tile_size = 32
+        self.atlas = {}  # (color, initial) -> pre-rendered tile pixmap
+        self.marker = None
+        self.camera = self.camera_target()
+        self.camera_timer = QTimer(self)
+        self.camera_timer.setInterval(16)
+        self.camera_timer.timeout.connect(self.step_camera)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
+
+    def sizeHint(self):
+        return QSize(self.view_tiles * 32, self.view_tiles * 32)
+
+    def minimumSizeHint(self):
+        return QSize(self.view_tiles * 8, self.view_tiles * 8)
+
+    def resizeEvent(self, event):
+        tile_size = max(8, min(self.width(), self.height()) // self.view_tiles)
+        if tile_size != self.tile_size:
+            self.tile_size = tile_size
+            self.atlas.clear()
+            self.marker = None
+        super().resizeEvent(event)
+
+    def tile_pixmap(self, location):
+        key = (location.color, location.name[0])
+        pixmap = self.atlas.get(key)
+        if pixmap is None:
+            pixmap = QPixmap(self.tile_size, self.tile_size)
+            pixmap.fill(QColor(location.color))
+            painter = QPainter(pixmap)
+            painter.setPen(QPen(Qt.black, 1))
+            painter.drawRect(0, 0, self.tile_size - 1, self.tile_size - 1)
+            font = QFont()
+            font.setBold(True)
+            font.setPixelSize(max(6, self.tile_size // 2))
+            painter.setFont(font)
+            painter.drawText(pixmap.rect(), Qt.AlignCenter, key[1])
+            painter.end()
+            self.atlas[key] = pixmap
+        return pixmap
+
+    def marker_pixmap(self):
+        if self.marker is None:
+            self.marker = QPixmap(self.tile_size, self.tile_size)
+            self.marker.fill(Qt.transparent)
+            painter = QPainter(self.marker)
+            painter.setPen(QPen(QColor("red"), 2))
+            painter.drawRect(1, 1, self.tile_size - 2, self.tile_size - 2)
+            painter.end()
+        return self.marker
+
+    def camera_target(self):
+        # Camera centre in tile units, clamped so the viewport never leaves the board
+        half = self.view_tiles / 2
+        size = self.game_board.size
+        x, y = self.player_position
+        return QPointF(min(max(x + 0.5, half), size - half),
+                       min(max(y + 0.5, half), size - half))
+
+    def origin(self):
+        # Widget pixel position of the board's top-left corner
+        return (round(self.width() / 2 - self.camera.x() * self.tile_size),
+                round(self.height() / 2 - self.camera.y() * self.tile_size))
+
+    def tile_rect(self, x, y):
+        origin_x, origin_y = self.origin()
+        return QRect(origin_x + x * self.tile_size, origin_y + y * self.tile_size,
+                     self.tile_size, self.tile_size)
+
+    def visible_rect(self):
+        # Tiles currently (at least partly) inside the widget as x, y, width, height
+        origin_x, origin_y = self.origin()
+        size = self.game_board.size
+        first_x = max(0, -origin_x // self.tile_size)
+        first_y = max(0, -origin_y // self.tile_size)
+        last_x = min(size - 1, (self.width() - origin_x) // self.tile_size)
+        last_y = min(size - 1, (self.height() - origin_y) // self.tile_size)
+        return first_x, first_y, last_x - first_x + 1, last_y - first_y + 1
+
+    def set_player_position(self, position):
+        old_position = self.player_position
+        self.player_position = position
+        if self.camera_target() != self.camera:
+            self.camera_timer.start()
+        else:
+            # Only the tile the player left and the one they entered need repainting
+            self.update(self.tile_rect(*old_position))
+            self.update(self.tile_rect(*position))
+
+    def step_camera(self):
+        target = self.camera_target()
+        delta = target - self.camera
+        if abs(delta.x()) < 0.02 and abs(delta.y()) < 0.02:
+            self.camera = target
+            self.camera_timer.stop()
+        else:
+            self.camera += delta * 0.25
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        rect = event.rect()
+        painter.fillRect(rect, self.palette().window())
+        origin_x, origin_y = self.origin()
+        size = self.game_board.size
+        first_x = max(0, (rect.left() - origin_x) // self.tile_size)
+        first_y = max(0, (rect.top() - origin_y) // self.tile_size)
+        last_x = min(size - 1, (rect.right() - origin_x) // self.tile_size)
+        last_y = min(size - 1, (rect.bottom() - origin_y) // self.tile_size)
+        for y in range(first_y, last_y + 1):
+            for x in range(first_x, last_x + 1):
+                location = self.game_board.get_location(x, y)
+                painter.drawPixmap(origin_x + x * self.tile_size, origin_y + y * self.tile_size,
+                                   self.tile_pixmap(location))
+        x, y = self.player_position
+        if first_x <= x <= last_x and first_y <= y <= last_y:
+            painter.drawPixmap(origin_x + x * self.tile_size, origin_y + y * self.tile_size,
+                               self.marker_pixmap())
+        painter.end()
+
+
+class MinimapWidget(QWidget):
+    def __init__(self, game_board, game_map, max_pixels=256, parent=None):
+        super().__init__(parent)
+        self.game_board = game_board
+        self.game_map = game_map
+        # Each minimap pixel covers scale x scale board tiles
+        self.scale = max(1, math.ceil(game_board.size / max_pixels))
+        self.image = None  # Built on first paint, so a hidden minimap costs nothing
+        self.player_position = game_map.player_position
+        game_map.camera_timer.timeout.connect(self.update)
+        if hasattr(game_board, 'subscribe'):
+            # Streaming worlds fill the minimap in as chunks are generated
+            game_board.subscribe('chunk_loaded', self.add_chunk)
+        self.setMinimumSize(120, 120)
+
+    def build_image(self):
+        pixels = math.ceil(self.game_board.size / self.scale)
+        image = QImage(pixels, pixels, QImage.Format_RGB32)
+        image.fill(QColor(self.game_board.wilderness.color))
+        for (x, y), location in self.game_board.named_positions().items():
+            image.setPixelColor(x // self.scale, y // self.scale, QColor(location.color))
+        return image
+
+    def add_chunk(self, coords, chunk):
+        if self.image is None:
+            return  # The first paint picks the chunk up from named_positions
+        for (x, y), location in chunk.items():
+            self.image.setPixelColor(x // self.scale, y // self.scale, QColor(location.color))
+        self.update()
+
+    def set_player_position(self, position):
+        self.player_position = position
+        self.update()
+
+    def paintEvent(self, event):
+        if self.image is None:
+            self.image = self.build_image()
+        painter = QPainter(self)
+        side = min(self.width(), self.height())
+        target = QRectF((self.width() - side) / 2, (self.height() - side) / 2, side, side)
+        painter.drawImage(target, self.image)
+        # Overlays in board tile units scaled onto the minimap
+        factor = side / self.game_board.size
+        first_x, first_y, width, height = self.game_map.visible_rect()
+        painter.setPen(QPen(QColor("#D4AF37"), 1))
+        painter.drawRect(QRectF(target.x() + first_x * factor, target.y() + first_y * factor,
+                                width * factor, height * factor))
+        x, y = self.player_position
+        painter.fillRect(QRectF(target.x() + x * factor, target.y() + y * factor,
+                                max(2.0, factor), max(2.0, factor)), QColor("red"))
+        painter.end()
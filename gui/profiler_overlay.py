@@ -0,0 +1,38 @@
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtWidgets import QLabel
+
+
+class ProfilerOverlay(QLabel):
+    # Latency table drawn over the top-right corner of the game window. It
+    # only reads the profiler's histograms, twice a second while shown.
+    def __init__(self, profiler, parent, rows=12):
+        super().__init__(parent)
+        self.profiler = profiler
+        self.rows = rows
+        self.setObjectName("ProfilerOverlay")
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.setTextFormat(Qt.PlainText)
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(500)
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.hide()
+
+    def toggle(self):
+        if self.isVisible():
+            self.refresh_timer.stop()
+            self.hide()
+        else:
+            self.refresh()
+            self.show()
+            self.raise_()
+            self.refresh_timer.start()
+
+    def refresh(self):
+        lines = [f"{'section':28} {'n':>6} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}"]
+        for name, count, p50, p99, longest in self.profiler.summary()[:self.rows]:
+            lines.append(f"{name:28} {count:>6} {p50:>8.3f} {p99:>8.3f} {longest:>8.3f}")
+        if len(lines) == 1:
+            lines.append("nothing timed yet")
+        self.setText('\n'.join(lines))
+        self.adjustSize()
+        self.move(self.parent().width() - self.width() - 10, 10)
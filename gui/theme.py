@@ -0,0 +1,166 @@
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QColor, QPainter, QPen, QPixmap
+
+# The whole application's look, applied once at start-up. Widgets pick their
+# rules through class names, object names and dynamic properties, so changing
+# how something looks at runtime only flips a property (see set_state).
+THEME = """
+QMainWindow, CombatDialog {
+    background-color: #2C3E50;
+    color: #ECF0F1;
+}
+QLabel {
+    color: #ECF0F1;
+    font-size: 14px;
+}
+QCheckBox {
+    color: #ECF0F1;
+}
+QListWidget, QTextEdit {
+    background-color: #34495E;
+    color: #ECF0F1;
+    border: 1px solid #7F8C8D;
+    border-radius: 5px;
+}
+
+StyledListWidget, StyledTextEdit, EventLogView {
+    background-color: #34495E;
+    border: 2px solid #D4AF37;
+    border-radius: 5px;
+    color: #ECF0F1;
+    font-family: 'Trajan Pro', serif;
+}
+StyledListWidget::item:selected {
+    background-color: #D4AF37;
+    color: #2C3E50;
+}
+StyledQLabel {
+    color: #D4AF37;
+}
+
+StyledButton, QPushButton#ActionButton, CharacterCreationWindow QPushButton {
+    background-color: #D4AF37;
+    color: #2C3E50;
+    border: none;
+    padding: 10px;
+    border-radius: 5px;
+}
+QPushButton#ActionButton, CharacterCreationWindow QPushButton {
+    font-size: 16px;
+    font-weight: bold;
+}
+StyledButton:hover, QPushButton#ActionButton:hover, CharacterCreationWindow QPushButton:hover {
+    background-color: #F1C40F;
+}
+
+StyledProgressBar {
+    border: none;
+    border-radius: 5px;
+    text-align: center;
+    color: #ECF0F1;
+    background-color: #2C3E50;
+}
+StyledProgressBar::chunk {
+    background-color: #E74C3C;
+    border-radius: 5px;
+}
+
+CharacterInfoWidget {
+    background-color: #34495E;
+    border-radius: 10px;
+    padding: 10px;
+}
+CharacterInfoWidget QLabel {
+    background-color: #34495E;
+}
+QLabel#CharacterName {
+    font-size: 18px;
+    font-weight: bold;
+}
+QLabel#Gold {
+    color: #F1C40F;
+    font-weight: bold;
+}
+QLabel[flash="up"] {
+    color: #00FF00;
+    font-weight: bold;
+}
+QLabel[flash="down"] {
+    color: #FF0000;
+    font-weight: bold;
+}
+QProgressBar#HealthBar {
+    border: 2px solid #4A4A4A;
+    border-radius: 5px;
+    text-align: center;
+    color: #FFFFFF;
+    background-color: #2C3E50;
+}
+QProgressBar#HealthBar::chunk {
+    background-color: #C0392B;
+}
+QProgressBar#HealthBar[band="high"]::chunk {
+    background-color: #27AE60;
+}
+QProgressBar#HealthBar[band="medium"]::chunk {
+    background-color: #F39C12;
+}
+
+CharacterCreationWindow {
+    background-color: #2C3E50;
+    color: #ECF0F1;
+    font-family: 'Trajan Pro', serif;
+}
+CharacterCreationWindow QLineEdit, CharacterCreationWindow QComboBox {
+    background-color: #34495E;
+    border: 2px solid #D4AF37;
+    border-radius: 5px;
+    padding: 5px;
+    color: #ECF0F1;
+    font-size: 14px;
+}
+
+QLabel#ProfilerOverlay {
+    background-color: rgba(0, 0, 0, 190);
+    color: #ECF0F1;
+    font-family: monospace;
+    font-size: 11px;
+    padding: 6px;
+    border-radius: 4px;
+}
+
+QMessageBox {
+    background-color: #2C3E50;
+    color: #ECF0F1;
+}
+QMessageBox QPushButton {
+    background-color: #D4AF37;
+    color: #2C3E50;
+    padding: 5px 15px;
+    border-radius: 3px;
+}
+"""
+
+
+def apply_theme(app):
+    app.setStyleSheet(THEME)
+
+
+def set_state(widget, name, value):
+    # Re-matches the widget against the already compiled theme; nothing is parsed
+    if widget.property(name) == value:
+        return
+    widget.setProperty(name, value)
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
+
+
+def swatch(color, size=20):
+    pixmap = QPixmap(size, size)
+    pixmap.fill(QColor(color))
+    painter = QPainter(pixmap)
+    painter.setPen(QPen(Qt.black, 1))
+    painter.drawRect(0, 0, size - 1, size - 1)
+    painter.end()
+    return pixmap
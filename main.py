@@ -1,43 +1,82 @@
 from gui.character_creation import CharacterCreationWindow
 from gui.main_window import GameGUI
+from gui.theme import apply_theme
+from game.journal import Journal
+from game.preload import WorldPreloader
+from game.profiler import Profiler, instrument_session
+from game.save import Autosaver, load_game
 from PyQt5.QtWidgets import (
     QApplication
 )
 from PyQt5.QtCore import QTimer
+import argparse
 import sys
 
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Game of Thrones RPG")
+    parser.add_argument('--board-size', type=int, default=10)
+    parser.add_argument('--sparse', action='store_true', help="store only named tiles")
+    parser.add_argument('--streaming', action='store_true',
+                        help="generate an unbounded world in chunks around the player")
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--journal', help="record player actions to this file for replay")
+    parser.add_argument('--load', help="continue from a save file instead of creating a character")
+    parser.add_argument('--save', help="autosave to this file (defaults to the --load file)")
+    parser.add_argument('--event-log', help="append event lines that scroll out of the log to this file")
+    parser.add_argument('--profile', metavar='PATH',
+                        help="time actions and UI handlers (F3 shows them) and write the histograms here on exit")
+    # Anything we don't recognise is left for Qt
+    args, qt_args = parser.parse_known_args(argv[1:])
+    if args.journal and args.load:
+        # A journal replays from a fresh character, which a save isn't
+        parser.error("--journal can't be combined with --load")
+    return args, qt_args
+
+def board_kind(args):
+    if args.streaming:
+        return 'streaming'
+    if args.sparse:
+        return 'sparse'
+    return 'dense'
+
 def main():
-    app = QApplication(sys.argv)
+    args, qt_args = parse_args(sys.argv)
+    app = QApplication(sys.argv[:1] + qt_args)
+    apply_theme(app)  # The only stylesheet the game ever parses
+    windows = []
+    # Disabled unless asked for, in which case nothing gets wrapped
+    profiler = Profiler(enabled=bool(args.profile))
 
-    def on_character_created(character):
-        game_window = GameGUI(character)
+    def start_game(session):
+        instrument_session(profiler, session)
+        # GameGUI reacts to model change events, so no polling loop is needed
+        game_window = GameGUI(session, log_path=args.event_log, profiler=profiler)
+        app.aboutToQuit.connect(game_window.dialogue_box.close_log)
+        save_path = args.save or args.load
+        if save_path:
+            # Only sections that changed since the last flush are written
+            autosaver = Autosaver(session, save_path)
+            autosave_timer = QTimer(game_window)
+            autosave_timer.timeout.connect(autosaver.flush)
+            autosave_timer.start(2000)
+            app.aboutToQuit.connect(autosaver.close)
+        if args.profile:
+            app.aboutToQuit.connect(lambda: profiler.dump(args.profile))
+        # Last, once the autosaver has written its final flush
+        app.aboutToQuit.connect(session.close)
         game_window.show()
-        game_loop(game_window)
+        windows.append(game_window)
 
-    character_creation = CharacterCreationWindow(on_character_created)
-    character_creation.show()
+    if args.load:
+        start_game(load_game(args.load))
+    else:
+        # The world is generated while the player fills in the form
+        preloader = WorldPreloader(args.seed, board_kind(args), args.board_size)
+        character_creation = CharacterCreationWindow(
+            lambda character: start_game(preloader.session(character, Journal(args.journal))))
+        character_creation.show()
 
     sys.exit(app.exec_())
 
-
-def game_loop(gui):
-    # This function will be called repeatedly by a QTimer
-    if gui.player.is_alive():
-        # Handle any recurring game logic here
-        gui.update_character_info()
-        gui.update_inventory()
-        gui.update_quests()
-        
-        # Check for quest completion
-        for quest in gui.quests:
-            if not quest.completed and quest.completion_condition(gui.player):
-                quest.complete(gui.player)
-                gui.dialogue_box.append(f"Quest completed: {quest.name}")
-        
-        # Schedule the next call to game_loop
-        QTimer.singleShot(100, lambda: game_loop(gui))
-    else:
-        gui.dialogue_box.append("Game Over!")
-
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -1,7 +1,24 @@
 from models.inventory import Inventory
+from models.observable import Observable
+
+class Character(Observable):
+    # Slots keep per-character memory small and fixed; subclasses add their own
+    __slots__ = ('name', 'house', 'strength', 'intelligence', 'charisma', 'defense',
+                 'health', 'gold', 'inventory', 'position', 'defending')
+
+    # Attribute -> event emitted as (attribute, old value, new value) when it changes
+    observed = {
+        'position': 'position_changed',
+        'health': 'health_changed',
+        'gold': 'gold_changed',
+        'strength': 'stats_changed',
+        'intelligence': 'stats_changed',
+        'charisma': 'stats_changed',
+        'defense': 'stats_changed',
+    }
 
-class Character:
     def __init__(self, name, house, strength, intelligence, charisma, defense):
+        super().__init__()
         self.name = name
         self.house = house
         self.strength = max(1, strength)  # Ensure strength is at least 1
@@ -14,6 +31,16 @@ class Character:
         self.position = (0, 0)
         self.defending = False
 
+    def __setattr__(self, name, value):
+        event = self.observed.get(name)
+        if event is None:
+            object.__setattr__(self, name, value)
+            return
+        old = getattr(self, name, None)
+        object.__setattr__(self, name, value)
+        if old != value:
+            self.emit(event, name, old, value)
+
     def take_damage(self, amount):
         self.health = max(0, self.health - amount)
 
@@ -29,12 +56,12 @@ class Character:
             self.position = (x - 1, y)
 
     def use_item(self, item_name):
-        for item in self.inventory.items:
-            if item.name == item_name:
-                item.use(self)
-                self.inventory.remove_item(item)
-                return True
-        return False
+        item = self.inventory.get(item_name)
+        if item is None:
+            return False
+        item.use(self)
+        self.inventory.remove_item(item)
+        return True
 
     def earn_gold(self, amount):
         self.gold += amount
@@ -49,6 +76,8 @@ class Character:
         return self.health > 0
 
 class Warrior(Character):
+    __slots__ = ()
+
     def __init__(self, name, house):
         super().__init__(name, house, strength=12, intelligence=8, charisma=8, defense=10)
 
@@ -56,6 +85,8 @@ class Warrior(Character):
         return "Sword Strike", 10  # Name and extra damage
 
 class Diplomat(Character):
+    __slots__ = ()
+
     def __init__(self, name, house):
         super().__init__(name, house, strength=8, intelligence=10, charisma=12, defense=8)
 
@@ -63,19 +94,28 @@ class Diplomat(Character):
         return "Persuasive Speech", 5  # Name and charisma boost
 
 class Maester(Character):
+    __slots__ = ()
+
     def __init__(self, name, house):
         super().__init__(name, house, strength=7, intelligence=13, charisma=9, defense=9)
 
     def special_ability(self):
         return "Healing Touch", 20  # Name and healing amount
 
+CHARACTER_CLASSES = {'Warrior': Warrior, 'Diplomat': Diplomat, 'Maester': Maester}
+
 class NPC:
-    def __init__(self, name, type):
+    __slots__ = ('name', 'type', 'position')
+
+    def __init__(self, name, type, position=None):
         self.name = name
         self.type = type
+        self.position = position
 
 
 class Boss(Character):
+    __slots__ = ('special_ability', 'max_health')
+
     def __init__(self, name, house, strength, intelligence, charisma, defense, special_ability):
         super().__init__(name, house, strength, intelligence, charisma, defense)
         self.special_ability = special_ability
@@ -100,13 +140,10 @@ def dragon_ability(self, target):
     target.take_damage(damage)
     return f"Drogon uses 'Dragonfire' and deals {damage} damage!"
 
-bosses = [
-    Boss("Cersei Lannister", "Lannister", 10, 15, 18, 8, cersei_ability),
-    Boss("Night King", "White Walkers", 20, 15, 10, 15, night_king_ability),
-    Boss("Drogon", "Targaryen", 25, 10, 5, 20, dragon_ability)
-]
-
-class NPC:
-    def __init__(self, name, type):
-        self.name = name
-        self.type = type
\ No newline at end of file
+def create_bosses():
+    # Fresh instances for every world; boss health is part of a game's state
+    return [
+        Boss("Cersei Lannister", "Lannister", 10, 15, 18, 8, cersei_ability),
+        Boss("Night King", "White Walkers", 20, 15, 10, 15, night_king_ability),
+        Boss("Drogon", "Targaryen", 25, 10, 5, 20, dragon_ability)
+    ]
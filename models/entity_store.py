@@ -0,0 +1,114 @@
+import numpy as np
+
+
+class EntityStore:
+    # Struct-of-arrays storage for large populations (armies, crowds). Each
+    # entity is an index into contiguous typed columns instead of an object,
+    # so whole-population updates are single numpy operations.
+    columns = {
+        'strength': np.int16,
+        'intelligence': np.int16,
+        'charisma': np.int16,
+        'defense': np.int16,
+        'health': np.int16,
+        'gold': np.int32,
+        'x': np.int32,
+        'y': np.int32,
+    }
+
+    def __init__(self, capacity=1024):
+        self.capacity = 0
+        self.end = 0  # One past the highest index ever used
+        self.free = []
+        self.used = np.zeros(0, dtype=bool)
+        for name, dtype in self.columns.items():
+            setattr(self, name, np.zeros(0, dtype=dtype))
+        self.grow(capacity)
+
+    def __len__(self):
+        return self.end - len(self.free)
+
+    def grow(self, capacity):
+        if capacity <= self.capacity:
+            return
+        capacity = max(capacity, self.capacity * 2)
+        for name in ('used',) + tuple(self.columns):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.end] = old[:self.end]
+            setattr(self, name, new)
+        self.capacity = capacity
+
+    def add(self, strength, intelligence, charisma, defense, health=100, gold=0, position=(0, 0)):
+        if self.free:
+            index = self.free.pop()
+        else:
+            self.grow(self.end + 1)
+            index = self.end
+            self.end += 1
+        x, y = position
+        values = (strength, intelligence, charisma, defense, health, gold, x, y)
+        for name, value in zip(self.columns, values):
+            getattr(self, name)[index] = value
+        self.used[index] = True
+        return index
+
+    def add_many(self, count, **values):
+        # Appends count entities at once; each value is a scalar or an array of
+        # length count. Columns left out start at their defaults.
+        defaults = {'health': 100}
+        start = self.end
+        self.grow(start + count)
+        indices = np.arange(start, start + count)
+        for name in self.columns:
+            getattr(self, name)[start:start + count] = values.get(name, defaults.get(name, 0))
+        self.used[start:start + count] = True
+        self.end += count
+        return indices
+
+    def add_character(self, character):
+        return self.add(character.strength, character.intelligence, character.charisma,
+                        character.defense, character.health, character.gold, character.position)
+
+    def remove(self, index):
+        if not self.used[index]:
+            return False
+        self.used[index] = False
+        self.free.append(index)
+        return True
+
+    def get(self, index):
+        if not self.used[index]:
+            raise KeyError(index)
+        return {name: getattr(self, name)[index].item() for name in self.columns}
+
+    def live(self):
+        return np.flatnonzero(self.used[:self.end])
+
+    def alive(self):
+        return np.flatnonzero(self.used[:self.end] & (self.health[:self.end] > 0))
+
+    def damage(self, indices, amounts):
+        # np.subtract.at applies repeated indices once per occurrence
+        end = self.end
+        health = self.health[:end].astype(np.int32)
+        np.subtract.at(health, indices, amounts)
+        np.clip(health, 0, None, out=health)
+        self.health[:end] = health
+
+    def heal(self, indices, amount, limit=100):
+        health = self.health[indices].astype(np.int32) + amount
+        self.health[indices] = np.minimum(health, limit)
+
+    def move(self, indices, dx, dy):
+        self.x[indices] += dx
+        self.y[indices] += dy
+
+    def in_rect(self, x0, y0, x1, y1):
+        end = self.end
+        x, y = self.x[:end], self.y[:end]
+        mask = self.used[:end] & (x >= x0) & (x < x1) & (y >= y0) & (y < y1)
+        return np.flatnonzero(mask)
+
+    def nbytes(self):
+        return self.used.nbytes + sum(getattr(self, name).nbytes for name in self.columns)
@@ -1,31 +1,96 @@
+from models.observable import Observable
+
 class Item:
-    def __init__(self, name, value, effect):
+    # Items are shared item types from the catalog; two items are the same
+    # item when they have the same id
+    __slots__ = ('id', 'name', 'value', 'effect')
+
+    def __init__(self, name, value, effect, id=None):
+        self.id = id
         self.name = name
         self.value = value
         self.effect = effect
 
+    def __eq__(self, other):
+        if not isinstance(other, Item):
+            return NotImplemented
+        if self.id is None or other.id is None:
+            return self is other
+        return self.id == other.id
+
+    def __hash__(self):
+        return hash(self.id) if self.id is not None else id(self)
+
+    def __repr__(self):
+        return f"Item({self.id}, {self.name!r})"
+
     def use(self, player):
         print(f"{player.name} uses {self.name}")
         self.effect(player)
 
 
-class Inventory:
+class Inventory(Observable):
+    # Identical items share one stack keyed by name, so lookups, use and
+    # removal never scan the inventory. Capacity counts stacks (slots).
     def __init__(self, capacity=10):
-        self.items = []
+        super().__init__()
+        self.stacks = {}  # name -> [item, count]
         self.capacity = capacity
+        self.total_value = 0
+        self.size = 0
 
-    def add_item(self, item):
-        if len(self.items) < self.capacity:
-            self.items.append(item)
-            return True
-        return False
+    def __len__(self):
+        return self.size
 
-    def remove_item(self, item):
-        if item in self.items:
-            self.items.remove(item)
-            return True
-        return False
+    def __contains__(self, name):
+        return name in self.stacks
 
-    def get_total_value(self):
-        return sum(item.value for item in self.items)
+    def __iter__(self):
+        # One (item, count) pair per stack, in the order the stacks were opened
+        return ((item, count) for item, count in self.stacks.values())
+
+    @property
+    def items(self):
+        return [item for item, count in self.stacks.values() for _ in range(count)]
 
+    def get(self, name):
+        stack = self.stacks.get(name)
+        return stack[0] if stack is not None else None
+
+    def count(self, name):
+        stack = self.stacks.get(name)
+        return stack[1] if stack is not None else 0
+
+    def is_full(self):
+        return len(self.stacks) >= self.capacity
+
+    def add_item(self, item, count=1):
+        stack = self.stacks.get(item.name)
+        if stack is None:
+            if self.is_full():
+                return False
+            self.stacks[item.name] = [item, count]
+        else:
+            stack[1] += count
+        self.size += count
+        self.total_value += item.value * count
+        self.emit('item_added', item)
+        return True
+
+    def remove_item(self, item, count=1):
+        # Accepts an item or an item name
+        name = getattr(item, 'name', item)
+        stack = self.stacks.get(name)
+        if stack is None or stack[1] < count:
+            return False
+        item = stack[0]
+        stack[1] -= count
+        if not stack[1]:
+            del self.stacks[name]
+        self.size -= count
+        self.total_value -= item.value * count
+        self.emit('item_removed', item)
+        return True
+
+    def get_total_value(self):
+        return self.total_value
@@ -0,0 +1,19 @@
+class Observable:
+    __slots__ = ('_listeners',)
+
+    def __init__(self):
+        self._listeners = {}
+
+    def subscribe(self, event, callback):
+        self._listeners.setdefault(event, []).append(callback)
+
+    def unsubscribe(self, event, callback):
+        callbacks = self._listeners.get(event)
+        if callbacks and callback in callbacks:
+            callbacks.remove(callback)
+
+    def emit(self, event, *args):
+        callbacks = self._listeners.get(event)
+        if callbacks:
+            for callback in tuple(callbacks):
+                callback(*args)
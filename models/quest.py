@@ -1,12 +1,136 @@
+from models.observable import Observable
+
 class Quest:
-    def __init__(self, name, description, reward, completion_condition):
+    __slots__ = ('name', 'description', 'rewards', 'triggers', 'prerequisites', 'completed')
+
+    def __init__(self, name, description, rewards, triggers, prerequisites=()):
         self.name = name
         self.description = description
-        self.reward = reward
-        self.completion_condition = completion_condition
+        self.rewards = rewards
+        self.triggers = triggers
+        self.prerequisites = tuple(prerequisites)
         self.completed = False
 
+    def completion_condition(self, player):
+        return all(trigger.is_met(player) for trigger in self.triggers)
+
     def complete(self, player):
         if not self.completed:
             self.completed = True
-            self.reward(player)
+            for reward in self.rewards:
+                reward.apply(player)
+
+
+class QuestLog(Observable):
+    # Stats whose change events can satisfy a stat trigger
+    stat_events = ('stats_changed', 'health_changed', 'gold_changed')
+
+    def __init__(self, quests=None):
+        super().__init__()
+        self.player = None
+        self.reset(quests or [])
+
+    def __iter__(self):
+        return iter(self.quests)
+
+    def __len__(self):
+        return len(self.quests)
+
+    def reset(self, quests):
+        self.quests = []
+        self.completed_names = set()
+        # (trigger kind, key) -> unlocked, unfinished quests watching it; dicts
+        # keep insertion order so completion order is reproducible
+        self.index = {}
+        # prerequisite name -> quests still waiting on it
+        self.waiting = {}
+        self.active = 0
+        for quest in quests:
+            self.add(quest)
+
+    def append(self, quest):
+        unlocked = self.add(quest)
+        self.emit('quest_added', quest)
+        if self.player is not None:
+            self.evaluate(unlocked)
+
+    def add(self, quest):
+        # Returns the quests this made live: the quest itself, or whatever was
+        # waiting on it if it arrives already completed
+        self.quests.append(quest)
+        if quest.completed:
+            self.completed_names.add(quest.name)
+            return self.release(quest.name)
+        self.active += 1
+        missing = [name for name in quest.prerequisites if name not in self.completed_names]
+        if missing:
+            for name in missing:
+                self.waiting.setdefault(name, []).append(quest)
+            return []
+        self.index_quest(quest)
+        return [quest]
+
+    def release(self, name):
+        unlocked = [waiting for waiting in self.waiting.pop(name, [])
+                    if not waiting.completed and self.is_unlocked(waiting)]
+        for waiting in unlocked:
+            self.index_quest(waiting)
+        return unlocked
+
+    def is_unlocked(self, quest):
+        return all(name in self.completed_names for name in quest.prerequisites)
+
+    def index_quest(self, quest):
+        for trigger in quest.triggers:
+            self.index.setdefault(trigger.index_key(), {})[quest] = None
+
+    def unindex_quest(self, quest):
+        for trigger in quest.triggers:
+            bucket = self.index.get(trigger.index_key())
+            if bucket is not None:
+                bucket.pop(quest, None)
+                if not bucket:
+                    del self.index[trigger.index_key()]
+
+    def watch(self, player):
+        self.player = player
+        player.subscribe('position_changed', self.on_position_changed)
+        for event in self.stat_events:
+            player.subscribe(event, self.on_stat_changed)
+        player.inventory.subscribe('item_added', self.on_item_changed)
+        player.inventory.subscribe('item_removed', self.on_item_changed)
+        self.check(player)
+
+    def on_position_changed(self, name, old, new):
+        self.evaluate_key(('position', new))
+
+    def on_stat_changed(self, name, old, new):
+        self.evaluate_key(('stat', name))
+
+    def on_item_changed(self, item):
+        self.evaluate_key(('item', item.name))
+
+    def evaluate_key(self, key):
+        bucket = self.index.get(key)
+        if bucket:
+            self.evaluate(list(bucket))
+
+    def check(self, player):
+        # Full pass over every unlocked quest; change events only look at the index
+        quests = {}
+        for bucket in self.index.values():
+            quests.update(bucket)
+        self.evaluate(list(quests))
+
+    def evaluate(self, quests):
+        for quest in quests:
+            if not quest.completed and quest.completion_condition(self.player):
+                self.finish(quest)
+
+    def finish(self, quest):
+        self.unindex_quest(quest)
+        self.completed_names.add(quest.name)
+        self.active -= 1
+        quest.complete(self.player)
+        self.emit('quest_completed', quest)
+        self.evaluate(self.release(quest.name))
@@ -0,0 +1,63 @@
+import random
+from collections import Counter
+from game.events import EVENTS, AliasSampler, EventCatalog, EventDirector
+from game.game_board import Location, create_locations
+from models.character import Warrior
+
+BASELINE = {"Bag of Gold", "Bandit Ambush", "Ancient Artifact", "Kind Stranger"}
+
+
+def test_every_location_rolls_the_baseline_events():
+    for name in [location.name for location in create_locations()] + ["Wilderness"]:
+        table = EVENTS.table_for(name)
+        assert table.chance == 0.3
+        assert {event.name for event in table.events} == BASELINE
+        assert len(set(table.weights)) == 1
+
+
+def test_draws_follow_the_table():
+    director = EventDirector()
+    location = create_locations()[0]
+    player = Warrior("Tester", None)
+    rng = random.Random(5)
+    draws = 40_000
+    counts = Counter(getattr(director.draw(location, player, rng), 'name', None) for _ in range(draws))
+    assert abs(counts[None] / draws - 0.7) < 0.01
+    for name in BASELINE:
+        assert abs(counts[name] / draws - 0.075) < 0.01
+
+
+def test_alias_sampler_matches_weights():
+    sampler = AliasSampler([1, 2, 5])
+    rng = random.Random(1)
+    counts = Counter(sampler.sample(rng) for _ in range(80_000))
+    for index, weight in enumerate([1, 2, 5]):
+        assert abs(counts[index] / 80_000 - weight / 8) < 0.01
+
+
+def test_conditions_cooldowns_and_regions():
+    # Content lives with the test; the shipped catalog stays the baseline port
+    events = [
+        {'name': "Heal", 'message': "Heal", 'effects': [('heal', 10)], 'conditions': [('health_below', 100)]},
+        {'name': "Gold", 'message': "Gold", 'effects': [('gold', 5)], 'cooldown': 3},
+        {'name': "Raid", 'message': "Raid", 'effects': [('ambush', "Bandit")]},
+    ]
+    tables = {
+        'base': {'chance': 1.0, 'events': {"Heal": 1, "Gold": 1}},
+        'north': {'extends': 'base', 'events': {"Raid": 1, "Heal": 0}},
+        'capital': {'extends': 'base', 'chance': 0.5},
+    }
+    catalog = EventCatalog(events, tables, {'north': ["Winterfell"]}, {"King's Landing": 'capital'}, 'base')
+    assert {event.name for event in catalog.table_for("Winterfell").events} == {"Gold", "Raid"}
+    assert catalog.table_for("King's Landing").chance == 0.5
+    assert catalog.table_for("Riverrun").name == 'base'
+
+    director = EventDirector(catalog)
+    location = Location("Riverrun", "#000000")
+    player = Warrior("Tester", None)
+    rng = random.Random(3)
+    # At full health only Gold can fire, and then once every four checks
+    drawn = [getattr(director.draw(location, player, rng), 'name', None) for _ in range(12)]
+    assert drawn == ["Gold", None, None, None] * 3
+    player.health = 50
+    assert director.draw(location, player, rng).name == "Heal"
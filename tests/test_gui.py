@@ -0,0 +1,37 @@
+import os
+import sys
+import pytest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+pytest.importorskip('PyQt5')
+
+from PyQt5.QtWidgets import QApplication, QInputDialog
+from game.profiler import Profiler
+from game.session import GameSession
+from gui import main_window
+from gui.main_window import GameGUI
+from models.character import Warrior
+
+
+@pytest.fixture
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.mark.parametrize('enabled', [True, False])
+def test_action_buttons_with_profiler(app, monkeypatch, tmp_path, enabled):
+    # An exception in a slot aborts the process unless sys.excepthook is replaced
+    errors = []
+    monkeypatch.setattr(sys, 'excepthook', lambda *exc: errors.append(exc))
+    monkeypatch.setattr(QInputDialog, 'getItem',
+                        staticmethod(lambda parent, title, label, options, current, editable: (options[current], True)))
+    monkeypatch.setattr(main_window.CombatDialog, 'exec_', lambda dialog: 0)
+
+    session = GameSession(Warrior("Tester", None), seed=1)
+    window = GameGUI(session, log_path=str(tmp_path / 'events.log'), profiler=Profiler(enabled=enabled))
+    for name, button in window.action_buttons.items():
+        button.click()
+        assert not errors, (name, errors)
+    if enabled:
+        assert window.profiler.histograms['handler.interact_with_npc'].count == 1
+    window.close()
@@ -0,0 +1,55 @@
+from game.quests import compile_quests
+from models.character import Warrior
+from models.quest import Quest, QuestLog
+
+# A chain of its own, so the shipped quests keep their baseline unlocks
+QUESTS = compile_quests([
+    {'name': "Scout", 'description': "Scout the road.",
+     'triggers': [('position', (5, 5))], 'rewards': [('gold', 10)]},
+    {'name': "Hold the Pass", 'description': "Hold the pass.",
+     'triggers': [('position', (0, 9)), ('stat', 'strength', 12)],
+     'rewards': [('stat', 'strength', 2)], 'requires': ["Scout"]},
+])
+
+
+def create(name, completed=False):
+    description, rewards, triggers, requires = QUESTS[name]
+    quest = Quest(name, description, rewards, triggers, requires)
+    quest.completed = completed
+    return quest
+
+
+def strong_player(position=(0, 0)):
+    player = Warrior("Tester", None)
+    player.strength = 13
+    player.position = position
+    return player
+
+
+def test_chained_quest_waits_for_its_prerequisite():
+    player = strong_player()
+    quests = QuestLog([create("Scout"), create("Hold the Pass")])
+    quests.watch(player)
+    hold = quests.quests[1]
+
+    player.position = (0, 9)
+    assert not hold.completed
+    player.position = (5, 5)  # Finishes the scouting
+    player.position = (0, 9)
+    assert hold.completed
+
+
+def test_completed_prerequisite_loaded_after_its_dependant():
+    # A save lists quests in any order; the waiting quest still unlocks
+    quests = QuestLog([create("Hold the Pass"), create("Scout", completed=True)])
+    assert not quests.waiting
+    quests.watch(strong_player((0, 9)))
+    assert all(quest.completed for quest in quests)
+
+
+def test_appending_a_completed_prerequisite_releases_waiters():
+    quests = QuestLog([create("Hold the Pass")])
+    quests.watch(strong_player((0, 9)))
+    assert not quests.quests[0].completed
+    quests.append(create("Scout", completed=True))
+    assert quests.quests[0].completed
@@ -0,0 +1,79 @@
+import random
+import pytest
+from game.session import GameSession
+from models.character import Warrior
+
+DIRECTIONS = ['north', 'south', 'east', 'west']
+
+
+def play(seed, policy):
+    session = GameSession(Warrior("Tester", None), seed=seed)
+    messages = []
+    session.subscribe('message', messages.append)
+    session.set_ambush_policy(policy)
+    rng = random.Random(seed)
+    for _ in range(4):
+        if not session.player.is_alive():
+            break
+        session.travel(rng.randrange(10), rng.randrange(10))
+        for _ in range(5):
+            session.move(rng.choice(DIRECTIONS))
+            if session.combat is not None:  # Only without a policy
+                session.resolve_combat(lambda engine: 'attack')
+    return session, messages
+
+
+@pytest.mark.parametrize('policy', ['Cautious', 'Attack', None])
+def test_move_and_travel_replay_to_the_same_state(policy):
+    for seed in range(40):
+        session, messages = play(seed, policy)
+        assert GameSession.replay(session.journal).state() == session.state(), seed
+
+
+def test_auto_resolved_ambush_turns_are_not_journaled():
+    ambushes = 0
+    for seed in range(40):
+        session, messages = play(seed, 'Cautious')
+        ambushes += messages.count("You are ambushed by bandits!")
+        assert ['set_ambush_policy', 'Cautious'] in session.journal.entries
+        assert not any(entry[0] == 'combat_step' for entry in session.journal.entries)
+    assert ambushes > 0
+
+
+def test_unknown_policy_is_rejected():
+    session = GameSession(Warrior("Tester", None), seed=0)
+    with pytest.raises(ValueError):
+        session.set_ambush_policy('Reckless')
+
+
+def scripted_session(seed):
+    # A bit of everything the window can journal, fights fought by hand
+    session = GameSession(Warrior("Tester", None), seed=seed)
+    for direction in ['east', 'east', 'south']:
+        session.move(direction)
+    session.buy('Health Potion')
+    session.buy('Shield')
+    session.buy('Strength Potion')
+    session.sell('Shield')
+    session.use_item('Strength Potion')
+    session.ask_information()
+    session.request_quest()
+    session.start_combat('Bandit')
+    turns = iter(['defend', 'use_item', 'attack'])
+    while session.combat is not None:
+        action = next(turns, 'attack')
+        session.combat_step(action, 'Health Potion' if action == 'use_item' else None)
+    session.rest()
+    session.travel(7, 8)
+    while session.combat is not None:
+        session.combat_step('attack')
+    session.mass_battle(100)
+    session.move('north')
+    return session
+
+
+def test_scripted_session_replays_to_the_same_state():
+    for seed in range(20):
+        session = scripted_session(seed)
+        assert any(entry[0] == 'combat_step' for entry in session.journal.entries)
+        assert GameSession.replay(session.journal).state() == session.state(), seed
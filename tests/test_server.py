@@ -0,0 +1,63 @@
+import asyncio
+import json
+import os
+from game.server import MAX_BOARD_SIZE, GameServer, shared_objects
+
+
+def request(server, writer, **fields):
+    return json.loads(server.handle(writer, json.dumps(fields).encode()))
+
+
+def test_board_size_is_capped():
+    server = GameServer()
+    reply = request(server, 'client', op='new', board_size=MAX_BOARD_SIZE + 1)
+    assert not reply['ok']
+    reply = request(server, 'client', op='new', board='hex')
+    assert not reply['ok']
+    reply = request(server, 'client', op='new', seed=1, board_size=5000)
+    assert reply['ok']
+    board = server.sessions[reply['session']].session.game_board
+    assert board.sparse and board.size == 5000
+
+
+def test_session_memory_leaves_out_shared_catalogs():
+    server = GameServer()
+    reply = request(server, 'client', op='new', seed=1)
+    hosted = server.sessions[reply['session']]
+    session = hosted.session
+    catalogs = [session.events.catalog, *(quest.triggers for quest in session.quests),
+                *(quest.rewards for quest in session.quests)]
+    skip = shared_objects()
+    assert hosted.memory(skip) == hosted.memory(skip + catalogs)
+
+
+def test_close_releases_the_world():
+    server = GameServer()
+    reply = request(server, 'client', op='new', seed=1, board='streaming')
+    world = server.sessions[reply['session']].session.game_board
+    assert request(server, 'client', op='close', session=reply['session'])['ok']
+    assert not os.path.exists(world.cache_dir)
+
+
+def test_disconnect_releases_the_world():
+    async def scenario():
+        server = GameServer()
+        listener = await asyncio.start_server(server.handle_client, '127.0.0.1', 0)
+        port = listener.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(b'{"op": "new", "seed": 1, "board": "streaming"}\n')
+        reply = json.loads(await reader.readline())
+        world = server.sessions[reply['session']].session.game_board
+        writer.close()
+        await writer.wait_closed()
+        for _ in range(100):
+            if not server.sessions:
+                break
+            await asyncio.sleep(0.01)
+        listener.close()
+        await listener.wait_closed()
+        return server, world
+
+    server, world = asyncio.run(scenario())
+    assert not server.sessions
+    assert not os.path.exists(world.cache_dir)
@@ -0,0 +1,16 @@
+import os
+from game.session import GameSession
+from models.character import Warrior
+
+
+def test_close_removes_the_chunk_cache():
+    session = GameSession(Warrior("Tester", None), seed=3, board='streaming')
+    world = session.game_board
+    # Walk far enough that chunks get evicted to the cache file
+    for _ in range(300):
+        session.step('east')
+    assert os.path.exists(world.cache_path)
+    cache_dir = world.cache_dir
+    session.close()
+    assert world.cache_file is None
+    assert not os.path.exists(cache_dir)